@@ -1,11 +1,20 @@
 import streamlit as st
 import pandas as pd
-from streamlit_local_storage import LocalStorage
+from strengthai.storage import get_storage
 from datetime import datetime
 import json
+from strengthai.pr_index import get_pr_index, pr_frame
+from strengthai.session_store import load_recent_sessions, load_sessions, session_count
+from strengthai.columnar import columnar_backend
+from strengthai.startup import FAILED, READY, start_warmup, warmup_status
+from strengthai.tracing import begin_rerun, end_rerun, span
 
 st.set_page_config(page_title="🏠 StrengthAI Home", layout="wide")
 
+# Load Milo's model and knowledge base in the background (once per server
+# process) so Ask Milo is ready by the time the user opens it
+start_warmup()
+
 # Dynamic greeting based on time
 hour = datetime.now().hour
 if hour < 12:
@@ -15,37 +24,26 @@ elif hour < 17:
 else:
     greeting = "Good evening"
 
+begin_rerun("Home")
 st.title(f"💪 {greeting}, Welcome to StrengthAI")
 st.markdown("Your AI-powered personalized training & rehab assistant.")
 
-# Load all sessions from localStorage
-localS = LocalStorage()
-SESSIONS_KEY = "workout_sessions"
-sessions = localS.getItem(SESSIONS_KEY)
-if not sessions or not isinstance(sessions, list):
-    sessions = []
-
-# Compute personal bests records
-best_records = {}
-for session in sessions:
-    wt_type = session.get("weight_type", "kg")
-    for ex, sets in session.get("exercises", {}).items():
-        for s in sets:
-            one_rm = round(s["Weight"] * (1 + (s["Reps"] + (10 - s["RPE"])) / 30), 2)
-            prev_best = best_records[ex]["Est. 1RM"] if ex in best_records and "Est. 1RM" in best_records[ex] else -float('inf')
-            if ex not in best_records or one_rm > prev_best:
-                best_records[ex] = {
-                    "Exercise": ex,
-                    "Best 1RM": one_rm,
-                    "Est. 1RM": one_rm,
-                    "Max Weight": s["Weight"],
-                    "Max Reps": s["Reps"],
-                    "Max RPE": s["RPE"],
-                    "Weight Type": wt_type
-                }
-
-if best_records:
-    pr_df = pd.DataFrame(list(best_records.values()))
+# Load only the most recent sessions from localStorage
+localS = get_storage()
+with span("storage.sessions"):
+    sessions = load_recent_sessions(localS, 5)
+    total_sessions = session_count(localS)
+
+# Personal bests come from the columnar bundle when one is configured,
+# otherwise from the persisted PR index (rebuilt only if missing/stale)
+backend = columnar_backend()
+with span("analytics.prs"):
+    if backend is not None:
+        pr_df = backend.personal_bests()
+    else:
+        pr_df = pr_frame(get_pr_index(localS, lambda: load_sessions(localS)))
+
+if not pr_df.empty:
     st.markdown("### 📊 Your Personal Bests (All Sessions)")
     st.dataframe(pr_df, use_container_width=True)
 else:
@@ -68,9 +66,9 @@ if sessions:
             return f"{mins} min"
         except Exception:
             return "-"
-    for i, session in enumerate(reversed(sessions[-5:])):
+    for i, session in enumerate(reversed(sessions)):
         hist_rows.append({
-            "Session #": len(sessions) - i,
+            "Session #": total_sessions - i,
             "Start": format_dt(session.get("start_time", "")),
             "Duration": calc_duration(session.get("start_time", ""), session.get("end_time", "")),
             "Exercises": ", ".join(session.get("exercises", {}).keys()),
@@ -100,34 +98,17 @@ with col2:
     st.subheader("📂 History")
     st.page_link("pages/4_History.py", label="View Full History", icon="📂")
 
-# --- Unified Export/Import ---
-def get_all_user_data(localS):
-    data = {}
-    data['workout_sessions'] = localS.getItem('workout_sessions') or []
-    data['body_stats'] = localS.getItem('body_stats') or []
-    return data
-
-def merge_all_user_data(localS, imported):
-    # Merge sessions
-    sessions = localS.getItem('workout_sessions') or []
-    imported_sessions = imported.get('workout_sessions', [])
-    merged_sessions = sessions + [s for s in imported_sessions if s not in sessions]
-    localS.setItem('workout_sessions', merged_sessions)
-    # Merge body stats
-    stats = localS.getItem('body_stats') or []
-    imported_stats = imported.get('body_stats', [])
-    merged_stats = stats.copy()
-    for entry in imported_stats:
-        match = [s for s in merged_stats if s["name"] == entry["name"] and s["date"] == entry["date"]]
-        if match:
-            if any(s for s in match if s == entry):
-                continue
-            else:
-                for s in match:
-                    s["name"] = f"{s['name']}-{entry['name']}"
-        else:
-            merged_stats.append(entry)
-    localS.setItem('body_stats', merged_stats)
-
 st.markdown('---')
 st.info('To backup or restore your data, please use the "💾 Backup & Restore" page.')
+
+warmup = warmup_status()
+if warmup["state"] == READY:
+    st.sidebar.caption(f"🧠 Milo ready ({warmup['elapsed']:.1f}s warm-up)")
+elif warmup["state"] == FAILED:
+    st.sidebar.caption(f"⚠️ Milo failed to load: {warmup['error']}")
+else:
+    st.sidebar.caption(f"🧠 Milo warming up ({warmup['step'] or 'starting'})…")
+
+# Send all queued localStorage writes
+localS.flush()
+end_rerun()
@@ -0,0 +1 @@
+# Benchmarks for StrengthAI's page data paths (python -m benchmarks.run)
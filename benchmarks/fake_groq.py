@@ -0,0 +1,153 @@
+import argparse
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local stand-in for Groq's OpenAI-compatible chat endpoint, for load-testing
+# the LLM gateway without an API key. It streams a canned answer word by
+# word and enforces its own requests-per-window limit, answering 429 with
+# Retry-After like the real API.
+#
+#   python -m benchmarks.fake_groq --port 8765 --rpm 30
+#   STRENGTHAI_GROQ_BASE_URL=http://127.0.0.1:8765 streamlit run Home.py
+ANSWER = ("Start with two warm-up sets, then work up to three sets of five at RPE 8. "
+          "Keep the bar path vertical and stop a set if the shoulder pain returns.")
+CHAT_PATH = "/openai/v1/chat/completions"
+
+
+class FakeGroq(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), rpm=30, window=60.0, first_token_s=0.2, token_s=0.005):
+        super().__init__(address, _Handler)
+        self.rpm = rpm
+        self.window = window
+        self.first_token_s = first_token_s
+        self.token_s = token_s
+        self.stats = {"requests": 0, "rate_limited": 0, "completed": 0, "max_concurrent": 0}
+        self.log = []  # (monotonic time, status, retry-after or None) per request
+        self._recent = deque()
+        self._active = 0
+        self._lock = threading.Lock()
+
+    # Clients giving up mid-stream are expected under load; don't print them
+    def handle_error(self, request, client_address):
+        pass
+
+    @property
+    def url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    # None if the request is admitted, else seconds until a slot frees up
+    def admit(self):
+        with self._lock:
+            now = time.monotonic()
+            self.stats["requests"] += 1
+            while self._recent and now - self._recent[0] >= self.window:
+                self._recent.popleft()
+            if len(self._recent) >= self.rpm:
+                self.stats["rate_limited"] += 1
+                wait = self.window - (now - self._recent[0])
+                self.log.append((now, 429, wait))
+                return wait
+            self._recent.append(now)
+            self.log.append((now, 200, None))
+            self._active += 1
+            self.stats["max_concurrent"] = max(self.stats["max_concurrent"], self._active)
+            return None
+
+    def release(self):
+        with self._lock:
+            self._active -= 1
+            self.stats["completed"] += 1
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, status, body, headers=()):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if self.path != CHAT_PATH:
+            self._json(404, {"error": {"message": "not found"}})
+            return
+        wait = self.server.admit()
+        if wait is not None:
+            self._json(429, {"error": {"message": "Rate limit reached", "type": "tokens", "code": "rate_limit_exceeded"}},
+                       [("retry-after", f"{wait:.3f}")])
+            return
+        try:
+            time.sleep(self.server.first_token_s)
+            if request.get("stream"):
+                self._stream(request)
+            else:
+                self._json(200, _completion(request, ANSWER))
+        finally:
+            self.server.release()
+
+    def _stream(self, request):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        words = ANSWER.split(" ")
+        for i, word in enumerate(words):
+            delta = {"role": "assistant", "content": word if i == 0 else " " + word}
+            self._event(_chunk(request, delta, None))
+            time.sleep(self.server.token_s)
+        self._event(_chunk(request, {}, "stop"))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def _event(self, body):
+        self.wfile.write(b"data: " + json.dumps(body).encode("utf-8") + b"\n\n")
+        self.wfile.flush()
+
+
+def _chunk(request, delta, finish_reason):
+    return {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": int(time.time()),
+            "model": request.get("model", "fake"),
+            "choices": [{"index": 0, "delta": delta, "logprobs": None, "finish_reason": finish_reason}]}
+
+
+def _completion(request, text):
+    tokens = len(text.split())
+    return {"id": "chatcmpl-fake", "object": "chat.completion", "created": int(time.time()),
+            "model": request.get("model", "fake"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text},
+                         "logprobs": None, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": tokens, "total_tokens": tokens}}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake Groq chat completions server.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rpm", type=int, default=30, help="Requests admitted per window")
+    parser.add_argument("--window", type=float, default=60.0, help="Rate-limit window in seconds")
+    args = parser.parse_args(argv)
+    server = FakeGroq(("127.0.0.1", args.port), rpm=args.rpm, window=args.window)
+    print(f"Fake Groq on {server.url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
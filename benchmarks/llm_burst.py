@@ -0,0 +1,86 @@
+import argparse
+import statistics
+import threading
+import time
+
+from benchmarks.fake_groq import FakeGroq
+from strengthai.llm import LLM_MODEL, make_client
+from strengthai.llm_gateway import LLMGateway
+
+# A burst of concurrent users against the fake Groq server, with and without
+# the gateway. Users ask one of `distinct` prompts, so some of them are
+# identical and in flight at the same time (two people opening the Planner
+# with the default query). Time is compressed: the server's limit and the
+# gateway's buckets use a `window`-second minute.
+#
+#   python -m benchmarks.llm_burst --users 40 --distinct 5 --rpm 10 --window 2
+
+
+def _user(llm, prompt, results, i):
+    start = time.perf_counter()
+    try:
+        text = "".join(c.content if hasattr(c, "content") else c for c in llm.stream(prompt))
+        results[i] = ("ok", time.perf_counter() - start, len(text))
+    except Exception as e:
+        results[i] = (type(e).__name__, time.perf_counter() - start, 0)
+
+
+def _sdk_client(base_url):
+    from langchain_groq import ChatGroq
+
+    return ChatGroq(groq_api_key="fake", model=LLM_MODEL, base_url=base_url)
+
+
+def burst(mode, users, distinct, rpm, window):
+    server = FakeGroq(rpm=rpm, window=window).start()
+    try:
+        if mode == "gateway":
+            gateway = LLMGateway(make_client("fake", LLM_MODEL, server.url), rpm=rpm, tpm=10 ** 9,
+                                 period=window, backoff=window / 10)
+            clients = [gateway] * users
+        else:
+            # One client per user with the SDK's own retries, as before the gateway
+            clients = [_sdk_client(server.url) for _ in range(users)]
+        results = [None] * users
+        threads = [threading.Thread(target=_user, args=(client, f"Give me today's plan #{i % distinct}", results, i))
+                   for i, client in enumerate(clients)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        server.shutdown()
+        server.server_close()
+    latencies = sorted(r[1] for r in results if r[0] == "ok")
+    return {
+        "mode": mode,
+        "ok": len(latencies),
+        "failed": users - len(latencies),
+        "upstream": server.stats["requests"],
+        "429s": server.stats["rate_limited"],
+        "p50_s": statistics.median(latencies) if latencies else float("nan"),
+        "max_s": latencies[-1] if latencies else float("nan"),
+        "wall_s": elapsed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Burst of concurrent LLM users against a fake Groq server.")
+    parser.add_argument("--users", type=int, default=40)
+    parser.add_argument("--distinct", type=int, default=5, help="Distinct prompts among the users")
+    parser.add_argument("--rpm", type=int, default=10, help="Server limit per window")
+    parser.add_argument("--window", type=float, default=2.0, help="Seconds standing in for a minute")
+    parser.add_argument("--modes", nargs="+", default=["direct", "gateway"], choices=["direct", "gateway"])
+    args = parser.parse_args(argv)
+
+    print(f"{'mode':<10}{'ok':>5}{'failed':>8}{'upstream':>10}{'429s':>6}{'p50 s':>8}{'max s':>8}{'wall s':>8}")
+    for mode in args.modes:
+        r = burst(mode, args.users, args.distinct, args.rpm, args.window)
+        print(f"{r['mode']:<10}{r['ok']:>5}{r['failed']:>8}{r['upstream']:>10}{r['429s']:>6}"
+              f"{r['p50_s']:>8.2f}{r['max_s']:>8.2f}{r['wall_s']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
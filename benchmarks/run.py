@@ -0,0 +1,175 @@
+import argparse
+import copy
+import io
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import pandas as pd
+from benchmarks.synthetic import MemoryStorage, generate_user_data
+from strengthai import analytics
+from strengthai.backup import export_backup, read_backup
+from strengthai.catalog import load_catalog
+from strengthai.columnar import ColumnarHistory, write_history
+from strengthai.merge import injury_identity, merge_body_stats, merge_records, plan_identity, session_identity
+from strengthai.pr_index import build_pr_index, pr_frame, update_pr_index
+from strengthai.session_store import load_recent_sessions, replace_sessions, session_count
+from strengthai.standards import rate_many
+
+# Timings of each page's data path on synthetic histories.
+#
+#   python -m benchmarks.run --sizes 10 1000 50000 --json bench.jsonl
+#   python -m benchmarks.run --baseline bench.jsonl   # exit 1 on regressions
+#
+# Every case is (setup, run): setup(data, workdir) builds its inputs untimed,
+# run(inputs) is timed. workdir is a scratch directory removed afterwards.
+# Results are one line per (case, sessions) in a fixed order and format, so
+# reports from two commits can be diffed or compared with --baseline.
+DEFAULT_SIZES = [10, 1000, 10000, 50000]
+MIN_RUNS = 3
+MAX_RUNS = 50
+TARGET_SECONDS = 0.5
+TOLERANCE = 1.5
+
+
+def _storage(data, workdir):
+    store = MemoryStorage()
+    replace_sessions(store, data["workout_sessions"])
+    return store
+
+
+def _home_recent(store):
+    return load_recent_sessions(store, 5), session_count(store)
+
+
+def _comparison_levels(index):
+    catalog = load_catalog()
+    pr_df = pr_frame(index, unit="kg")
+    matched = [(catalog.display_name(catalog.resolve(r["Exercise"])), r["Best 1RM"])
+               for r in pr_df.to_dict("records") if catalog.resolve(r["Exercise"])]
+    return rate_many("male", "kg", "bodyweight", [m[0] for m in matched], [m[1] for m in matched], 80.0)
+
+
+def _open_session(session):
+    return [analytics.add_set_metrics(pd.DataFrame(sets)) for sets in session["exercises"].values() if sets]
+
+
+# Import the full dataset into a store that already has the first half
+def _merge_setup(data, workdir):
+    half = {name: (value[:len(value) // 2] if isinstance(value, list) else value) for name, value in data.items()}
+    return half, data
+
+
+def _merge(args):
+    existing, imported = args
+    merge_records(existing["workout_sessions"], imported["workout_sessions"], session_identity)
+    merge_records(existing["injury_history"], imported["injury_history"], injury_identity)
+    merge_records(existing["plan_history"], imported["plan_history"], plan_identity)
+    merge_body_stats(existing["body_stats"], imported["body_stats"])
+
+
+def _columnar_setup(data, workdir):
+    path = os.path.join(workdir, "bundle")
+    write_history(data["workout_sessions"], path)
+    return path
+
+
+CASES = [
+    ("home.recent_sessions", _storage, _home_recent),
+    ("home.pr_index_rebuild", lambda d, w: d["workout_sessions"], lambda s: pr_frame(build_pr_index(s))),
+    ("logger.pr_index_update", lambda d, w: (build_pr_index(d["workout_sessions"]), d["workout_sessions"][-1]),
+     lambda a: update_pr_index(copy.deepcopy(a[0]), a[1], a[0]["sessions"] + 1)),
+    ("history.session_summary", lambda d, w: d["workout_sessions"], analytics.session_summary),
+    ("history.open_session", lambda d, w: d["workout_sessions"][-1], _open_session),
+    ("comparison.levels", lambda d, w: build_pr_index(d["workout_sessions"]), _comparison_levels),
+    ("backup.export_gzip", lambda d, w: d, export_backup),
+    ("backup.import_gzip", lambda d, w: export_backup(d), lambda blob: read_backup(io.BytesIO(blob))),
+    ("backup.merge", _merge_setup, _merge),
+    ("columnar.build", lambda d, w: (d["workout_sessions"], os.path.join(w, "build")),
+     lambda a: write_history(*a)),
+    ("columnar.personal_bests", _columnar_setup, lambda p: ColumnarHistory(p).personal_bests()),
+    ("columnar.session_summary", _columnar_setup, lambda p: ColumnarHistory(p).session_summary()),
+]
+
+
+# Median and minimum wall time (ms) of `fn(arg)`, run at least MIN_RUNS
+# times and until TARGET_SECONDS have been spent (capped at MAX_RUNS)
+def time_case(fn, arg):
+    times = []
+    spent = 0.0
+    while len(times) < MIN_RUNS or (spent < TARGET_SECONDS and len(times) < MAX_RUNS):
+        start = time.perf_counter()
+        fn(arg)
+        elapsed = time.perf_counter() - start
+        times.append(elapsed * 1000)
+        spent += elapsed
+    return statistics.median(times), min(times), len(times)
+
+
+def run(sizes, cases=None, seed=0):
+    results = []
+    for size in sizes:
+        data = generate_user_data(size, seed)
+        for name, setup, fn in CASES:
+            if cases and not any(name.startswith(c) for c in cases):
+                continue
+            workdir = tempfile.mkdtemp(prefix="strengthai-bench-")
+            try:
+                median, best, runs = time_case(fn, setup(data, workdir))
+            finally:
+                shutil.rmtree(workdir, ignore_errors=True)
+            results.append({"case": name, "sessions": size, "median_ms": round(median, 3),
+                            "min_ms": round(best, 3), "runs": runs})
+    return results
+
+
+def format_report(results):
+    lines = [f"{'case':<28}{'sessions':>9}{'median ms':>12}{'min ms':>12}{'runs':>6}"]
+    for r in results:
+        lines.append(f"{r['case']:<28}{r['sessions']:>9}{r['median_ms']:>12.3f}{r['min_ms']:>12.3f}{r['runs']:>6}")
+    return "\n".join(lines)
+
+
+# Cases whose median got slower than `tolerance` x the baseline's
+def regressions(results, baseline, tolerance=TOLERANCE):
+    before = {(b["case"], b["sessions"]): b for b in baseline}
+    slower = []
+    for r in results:
+        b = before.get((r["case"], r["sessions"]))
+        if b and r["median_ms"] > b["median_ms"] * tolerance:
+            slower.append((r, b))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time StrengthAI page data paths on synthetic histories.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Session counts")
+    parser.add_argument("--cases", nargs="*", help="Only cases starting with these prefixes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write results as JSON lines to this file")
+    parser.add_argument("--baseline", help="JSON lines from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.cases, args.seed)
+    print(format_report(results))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            for r in results:
+                f.write(json.dumps(r, sort_keys=True) + "\n")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = [json.loads(line) for line in f if line.strip()]
+        slower = regressions(results, baseline, args.tolerance)
+        for r, b in slower:
+            print(f"REGRESSION {r['case']} @ {r['sessions']}: {b['median_ms']:.3f} -> {r['median_ms']:.3f} ms")
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
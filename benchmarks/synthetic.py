@@ -0,0 +1,137 @@
+import random
+from datetime import datetime, timedelta
+
+# Deterministic synthetic StrengthAI user data. The same (sessions, seed)
+# always yields the same records, so benchmark runs are comparable across
+# commits. Shapes match what the pages store in localStorage.
+START_DATE = datetime(2019, 1, 7, 7, 0)
+
+# (exercise, starting working weight in kg, weekly progression in kg)
+EXERCISES = {
+    "Squat": (80.0, 1.0),
+    "Bench Press": (60.0, 0.5),
+    "Deadlift": (100.0, 1.25),
+    "Overhead Press": (35.0, 0.25),
+    "Barbell Row": (50.0, 0.5),
+    "Lat Pulldown": (45.0, 0.5),
+    "Bicep Curl": (20.0, 0.125),
+    "Front Squat": (60.0, 0.75),
+    "Romanian Deadlift": (70.0, 0.75),
+}
+DAY_TEMPLATES = [
+    ["Squat", "Bench Press", "Barbell Row", "Bicep Curl"],
+    ["Deadlift", "Overhead Press", "Lat Pulldown"],
+    ["Front Squat", "Bench Press", "Romanian Deadlift", "Lat Pulldown", "Bicep Curl"],
+    ["Squat", "Overhead Press", "Barbell Row"],
+]
+KG_PER_LB = 0.45359237
+
+
+class MemoryStorage:
+    # Dict-backed stand-in for the storage gateway, for timing the
+    # localStorage-facing helpers without a browser
+    def __init__(self, items=None):
+        self.items = dict(items or {})
+
+    def getItem(self, item_key):
+        return self.items.get(item_key)
+
+    def setItem(self, item_key, item_value, key=None):
+        self.items[item_key] = item_value
+
+    def eraseItem(self, item_key, key=None):
+        self.items.pop(item_key, None)
+
+
+def _round_to(value, step):
+    return round(value / step) * step
+
+
+def generate_sessions(n, seed=0, lb_share=0.3):
+    rng = random.Random(seed)
+    sessions = []
+    when = START_DATE
+    unit = "lb" if rng.random() < lb_share else "kg"
+    for i in range(n):
+        day = when.date() + timedelta(days=rng.choice([1, 1, 2, 2, 3]))
+        when = datetime(day.year, day.month, day.day, rng.randint(6, 20), rng.choice([0, 15, 30, 45]))
+        # Occasionally switch gyms / units
+        if rng.random() < 0.01:
+            unit = "lb" if unit == "kg" else "kg"
+        weeks = (when - START_DATE).days / 7
+        exercises = {}
+        for ex in DAY_TEMPLATES[i % len(DAY_TEMPLATES)]:
+            base, per_week = EXERCISES[ex]
+            working = base + per_week * weeks * rng.uniform(0.6, 1.0)
+            sets = []
+            for _ in range(rng.randint(2, 5)):
+                reps = rng.choice([1, 3, 5, 5, 5, 8, 8, 10, 12])
+                weight = working * (1.0 + (5 - reps) * 0.03) * rng.uniform(0.9, 1.05)
+                weight = _round_to(weight / KG_PER_LB, 5.0) if unit == "lb" else _round_to(weight, 2.5)
+                sets.append({"Weight": float(weight), "Reps": reps, "RPE": rng.choice([6, 6.5, 7, 7.5, 8, 8.5, 9, 9.5, 10])})
+            exercises[ex] = sets
+        end = when + timedelta(minutes=rng.randint(40, 110))
+        sessions.append({
+            "start_time": when.isoformat(),
+            "exercises": exercises,
+            "weight_type": unit,
+            "end_time": end.isoformat(),
+        })
+    return sessions
+
+
+def generate_body_stats(n, seed=0, name="athlete"):
+    rng = random.Random(seed + 1)
+    weight = rng.uniform(65, 95)
+    stats = []
+    for i in range(n):
+        weight += rng.uniform(-0.6, 0.7)
+        stats.append({
+            "name": name,
+            "age": 25 + i // 52,
+            "height": 178,
+            "weight": round(weight, 1),
+            "date": (START_DATE + timedelta(weeks=i)).date().isoformat(),
+        })
+    return stats
+
+
+def generate_injury_history(n, seed=0):
+    rng = random.Random(seed + 2)
+    complaints = ["My shoulder hurts when I bench press", "Lower back pain after deadlifts",
+                  "Knee pain at the bottom of squats", "Elbow pain during curls"]
+    history = []
+    for i in range(n):
+        complaint = rng.choice(complaints)
+        history.append({
+            "query": f"{complaint} (#{i})",
+            "tests": "1. Hawkins-Kennedy test: ...\n2. Neer's test: ...\n3. Empty can test: ...",
+            "test_results": rng.choice(["Hawkins-Kennedy was painful", "No pain on any test", "Neer's test was painful"]),
+            "response": "\n".join(f"- Corrective drill {j}: 3x{rng.randint(8, 15)} daily" for j in range(6)),
+        })
+    return history
+
+
+def generate_plan_history(n, seed=0):
+    rng = random.Random(seed + 3)
+    return [{
+        "timestamp": str(START_DATE + timedelta(days=2 * i)),
+        "query": rng.choice(["Give me today's squat plan", "Give me today's full training plan"]),
+        "plan": "| Exercise | Sets | Reps | Weight | RPE |\n" + "\n".join(
+            f"| Lift {j} | 3 | {rng.randint(3, 10)} | {rng.randint(40, 180)} | 8 |" for j in range(5)),
+    } for i in range(n)]
+
+
+# Full backup-shaped dataset scaled from the session count
+def generate_user_data(sessions, seed=0):
+    workout_sessions = generate_sessions(sessions, seed)
+    injuries = generate_injury_history(max(1, sessions // 50), seed)
+    plans = generate_plan_history(max(1, sessions // 5), seed)
+    return {
+        "workout_sessions": workout_sessions,
+        "body_stats": generate_body_stats(max(1, sessions // 3), seed),
+        "injury_history": injuries,
+        "plan_history": plans,
+        "latest_injury": injuries[-1],
+        "latest_plan": plans[-1],
+    }
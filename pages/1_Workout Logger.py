@@ -1,19 +1,17 @@
 import streamlit as st
 import pandas as pd
-from streamlit_local_storage import LocalStorage
+from strengthai.storage import get_storage
 from datetime import datetime
 import json
+from strengthai import analytics
+from strengthai.pr_index import get_pr_index, record_session
+from strengthai.session_store import append_session, load_sessions
+from strengthai.tracing import begin_rerun, end_rerun, span
 
+begin_rerun("Workout Logger")
 st.title("Workout Logger")
 
-localS = LocalStorage()
-SESSIONS_KEY = "workout_sessions"
-
-# Helper: Load all sessions from localStorage
-sessions = localS.getItem(SESSIONS_KEY)
-if not sessions or not isinstance(sessions, list):
-    sessions = []
-
+localS = get_storage()
 # Session state for current session
 if "active_session" not in st.session_state:
     st.session_state.active_session = None
@@ -75,8 +73,7 @@ else:
         if session["exercises"][exercise]:
             st.write("📋 Sets:")
             set_df = pd.DataFrame(session["exercises"][exercise])
-            set_df["Volume"] = set_df["Weight"] * set_df["Reps"]
-            set_df["Est. 1RM"] = set_df.apply(lambda row: round(row["Weight"] * (1 + (row["Reps"] + (10 - row["RPE"])) / 30), 2), axis=1)
+            set_df = analytics.add_set_metrics(set_df)
             for idx, row in set_df.iterrows():
                 is_editing = st.session_state['editing_set'] == (exercise, idx)
                 # Use session start time as part of the key for uniqueness
@@ -102,26 +99,31 @@ else:
                         session["exercises"][exercise][idx] = {"Weight": new_weight, "Reps": new_reps, "RPE": new_rpe}
                         st.session_state['editing_set'] = None
                         st.session_state['edit_buffer'] = {}
-                        st.rerun()
+                        localS.rerun()
                     if cols2[4].button("Cancel", key=f"cancel_{key_prefix}"):
                         st.session_state['editing_set'] = None
                         st.session_state['edit_buffer'] = {}
-                        st.rerun()
+                        localS.rerun()
                 else:
                     if cols2[1].button("Edit", key=f"edit_{key_prefix}"):
                         st.session_state['editing_set'] = (exercise, idx)
-                        st.rerun()
+                        localS.rerun()
                     if cols2[2].button("Delete", key=f"del_{key_prefix}"):
                         session["exercises"][exercise].pop(idx)
                         st.session_state['editing_set'] = None
                         st.session_state['edit_buffer'] = {}
-                        st.rerun()
+                        localS.rerun()
             st.dataframe(set_df)
     # End session
     if st.button("End Session and Save"):
         session["end_time"] = datetime.now().isoformat()
-        sessions.append(session)
-        localS.setItem(SESSIONS_KEY, sessions)
+        # Only this month's segment is rewritten
+        with span("storage.save_session"):
+            # Index read before the append still matches the stored count, so
+            # the new session is folded in instead of triggering a rebuild
+            pr_index = get_pr_index(localS, lambda: load_sessions(localS))
+            session_no = append_session(localS, session)
+            record_session(localS, pr_index, session, session_no)
         st.session_state.active_session = None
         st.success("Session saved!")
     if st.button("Cancel Session"):
@@ -130,3 +132,7 @@ else:
 
 st.markdown('---')
 st.info('To backup or restore your data, please use the "💾 Backup & Restore" page.')
+
+# Send all queued localStorage writes
+localS.flush()
+end_rerun()
@@ -1,18 +1,22 @@
 import streamlit as st
 import os
 import json
-from langchain_community.vectorstores import FAISS
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_core.prompts import PromptTemplate
-from langchain_groq import ChatGroq
-from langchain.chains import ConversationalRetrievalChain
+import time
 from dotenv import load_dotenv
-from streamlit_local_storage import LocalStorage
+from strengthai.storage import get_storage
+from strengthai.milo_resources import cache_version, get_chunks, get_embeddings, get_response_cache, retrieve_chunk_ids
+from strengthai.milo_pipeline import condense_question, reusable_chunks
+from strengthai.llm import get_llm
+from strengthai.startup import FAILED, READY, start_warmup, warmup_status
+from strengthai.streaming import stream_text, write_stream
+from strengthai.tracing import begin_rerun, end_rerun, span
 
 # Load environment variables
 load_dotenv()
 groq_api_key = os.getenv("GROQ_API_KEY")
 
+begin_rerun("Ask Milo")
+
 # Page title
 st.title("🧠 Injury Assistant (Ask Milo)")
 
@@ -25,32 +29,33 @@ if "awaiting_test_input" not in st.session_state:
     st.session_state.awaiting_test_input = False
 if "initial_query" not in st.session_state:
     st.session_state.initial_query = ""
+if "step1_retrieval" not in st.session_state:
+    st.session_state.step1_retrieval = None
 
 # LocalStorage instance (move to top, like in 3_Planner.py)
-localS = LocalStorage()
-
-# Load vectorstore and embeddings
-embeddings = HuggingFaceEmbeddings(model_name="./models", model_kwargs={"device": "cpu"})
-
-vectorstore = FAISS.load_local("pages/data/milo_index", embeddings, allow_dangerous_deserialization=True)
-retriever = vectorstore.as_retriever(search_type="similarity", k=5)
+localS = get_storage()
+
+# The embedding model, index and LLM client load in a background thread
+# (started here too in case this is the first page opened). Until they are
+# ready the page polls instead of blocking; if the warm-up failed, load
+# directly below so the real error is shown.
+start_warmup()
+warmup = warmup_status()
+if warmup["state"] not in (READY, FAILED):
+    st.info(f"🧠 Milo is warming up ({warmup['step'] or 'starting'}, {warmup['elapsed']:.0f}s)… "
+            "the page will continue on its own.")
+    end_rerun()
+    time.sleep(1)
+    localS.rerun()
+
+# Embeddings and the index are loaded once per server process
+embeddings = get_embeddings()
+response_cache = get_response_cache()
 
 # Set up LLM
-llm = ChatGroq(
-    groq_api_key=groq_api_key,
-    model="llama-3.1-8b-instant"
-)
-
-# Step 1: Describe symptoms and get diagnostic tests
-if not st.session_state.awaiting_test_input:
-    st.subheader("Step 1: Describe your issue")
-    query = st.text_area("❓ What's bothering you?", placeholder="e.g., My lower back hurts when I deadlift")
+llm = get_llm(groq_api_key)
 
-    if st.button("🔍 Get Diagnostic Tests") and query.strip() != "":
-        with st.spinner("Analyzing symptoms and generating diagnostic tests..."):  #loading
-            prompt_1 = PromptTemplate(
-                input_variables=["question", "context"],
-                template="""
+DIAGNOSTIC_TEMPLATE = """
                         You are Milo, a top injury rehab expert. A patient says:
                         "{question}"
 
@@ -59,36 +64,8 @@ if not st.session_state.awaiting_test_input:
                         Context:
                         {context}
                         """
-            )
-            qa_chain_1 = ConversationalRetrievalChain.from_llm(
-                llm=llm,
-                retriever=retriever,
-                combine_docs_chain_kwargs={"prompt": prompt_1}
-            )
-            response_1 = qa_chain_1.run({
-                "question": query,
-                "chat_history": []
-            })
-
-            st.session_state.diagnostic_tests = response_1
-            st.session_state.initial_query = query
-            st.session_state.awaiting_test_input = True
-
-# Step 2: Show tests and ask user to confirm the step
-if st.session_state.awaiting_test_input:
-    st.subheader("Step 2: Confirm test results")
-    st.markdown("**Milo recommends the following diagnostic tests:**")
-    st.markdown(st.session_state.diagnostic_tests)
 
-    user_followup = st.text_area("✏️ Describe what happened when you performed the tests.",
-                                 placeholder="e.g., Neer's test was painful but Hawkins-Kennedy was okay")
-
-    if st.button("✅ Get Fixes") and user_followup.strip() != "":
-        with st.spinner("Analyzing test outcomes and generating corrective plan..."):
-            combined_input = f"Original issue: {st.session_state.initial_query}\n\nTest results: {user_followup}"
-            prompt_2 = PromptTemplate(
-                input_variables=["question", "context"],
-                template="""
+CORRECTIVE_TEMPLATE = """
                         You are Milo, a top injury rehab expert. A user said:
 
                         {question}
@@ -99,34 +76,90 @@ if st.session_state.awaiting_test_input:
                         Context:
                         {context}
                         """
-            )
-            qa_chain_2 = ConversationalRetrievalChain.from_llm(
-                llm=llm,
-                retriever=retriever,
-                combine_docs_chain_kwargs={"prompt": prompt_2}
-            )
-            response_2 = qa_chain_2.run({
-                "question": combined_input,
-                "chat_history": st.session_state.chat_history
-            })
-
-            st.subheader("🛠️ Corrective Plan")
-            st.markdown(response_2)
-            st.session_state.chat_history.append((combined_input, response_2))
-
-            # Show a button to reset awaiting_test_input and save to localStorage
-            if st.button('Done - Reset for next session'):
-                latest_injury = {
-                    "query": st.session_state.initial_query,
-                    "tests": st.session_state.diagnostic_tests,
-                    "test_results": user_followup,
-                    "response": response_2
-                }
-                plan_history = localS.getItem('injury_history')
-                # # if not plan_history or not isinstance(plan_history, list):
-                # #     plan_history = []
-                # plan_history.append(latest_injury)
-                localS.setItem('injury_history', plan_history)
-                localS.setItem('latest_injury', latest_injury)
-                st.session_state.awaiting_test_input = False
-                st.rerun()
\ No newline at end of file
+
+# Retrieve-then-generate. With chat history the question is first condensed
+# into a standalone one (cached, so at most one extra LLM call per distinct
+# follow-up); without history it is used as is. `reuse` is an earlier
+# retrieval whose chunks are used again if this query is close to it.
+# Answers come from the semantic cache when a near-identical question
+# retrieved the same chunks under the same prompt; otherwise they are
+# streamed into the page and cached. Returns (answer, retrieval).
+def ask_milo(question, template, chat_history, spinner_text, reuse=None):
+    with st.spinner(spinner_text):
+        if chat_history:
+            with span("llm.condense"):
+                question = condense_question(llm, question, tuple(chat_history))
+        with span("retrieval.embed"):
+            query_vec = embeddings.embed_query(question)
+        chunk_ids = reusable_chunks(query_vec, reuse) or retrieve_chunk_ids(query_vec, question)
+        version = cache_version(template)
+        cached = response_cache.lookup(query_vec, chunk_ids, version)
+    retrieval = {"vec": list(query_vec), "chunk_ids": chunk_ids}
+    if cached is not None:
+        st.markdown(cached)
+        return cached, retrieval
+    context = "\n\n".join(doc.page_content for doc in get_chunks(chunk_ids))
+    response = write_stream(stream_text(llm, template.format(question=question, context=context)))
+    response_cache.store(query_vec, chunk_ids, version, response, query=question)
+    return response, retrieval
+
+# Step 1: Describe symptoms and get diagnostic tests
+if not st.session_state.awaiting_test_input:
+    st.subheader("Step 1: Describe your issue")
+    query = st.text_area("❓ What's bothering you?", placeholder="e.g., My lower back hurts when I deadlift")
+
+    if st.button("🔍 Get Diagnostic Tests") and query.strip() != "":
+        response_1, st.session_state.step1_retrieval = ask_milo(
+            query, DIAGNOSTIC_TEMPLATE, [], "Analyzing symptoms and generating diagnostic tests...")
+
+        st.session_state.diagnostic_tests = response_1
+        st.session_state.initial_query = query
+        st.session_state.awaiting_test_input = True
+        localS.rerun()
+
+# Step 2: Show tests and ask user to confirm the step
+if st.session_state.awaiting_test_input:
+    st.subheader("Step 2: Confirm test results")
+    st.markdown("**Milo recommends the following diagnostic tests:**")
+    st.markdown(st.session_state.diagnostic_tests)
+
+    user_followup = st.text_area("✏️ Describe what happened when you performed the tests.",
+                                 placeholder="e.g., Neer's test was painful but Hawkins-Kennedy was okay")
+
+    if st.button("✅ Get Fixes") and user_followup.strip() != "":
+        combined_input = f"Original issue: {st.session_state.initial_query}\n\nTest results: {user_followup}"
+        st.subheader("🛠️ Corrective Plan")
+        response_2, _ = ask_milo(combined_input, CORRECTIVE_TEMPLATE, st.session_state.chat_history,
+                                 "Analyzing test outcomes and generating corrective plan...",
+                                 reuse=st.session_state.step1_retrieval)
+        st.session_state.chat_history.append((combined_input, response_2))
+        st.session_state.corrective_plan = response_2
+
+        # Save to localStorage once the full plan has been generated
+        latest_injury = {
+            "query": st.session_state.initial_query,
+            "tests": st.session_state.diagnostic_tests,
+            "test_results": user_followup,
+            "response": response_2
+        }
+        injury_history = localS.get_list('injury_history')
+        injury_history.append(latest_injury)
+        localS.setItem('injury_history', injury_history, key='injury_history')
+        localS.setItem('latest_injury', latest_injury, key='latest_injury')
+    elif st.session_state.get("corrective_plan"):
+        st.subheader("🛠️ Corrective Plan")
+        st.markdown(st.session_state.corrective_plan)
+
+    # Reset awaiting_test_input for the next issue
+    if st.session_state.get("corrective_plan") and st.button('Done - Reset for next session'):
+        st.session_state.awaiting_test_input = False
+        st.session_state.corrective_plan = ""
+        localS.rerun()
+
+# Cache effectiveness for this server process
+cache_stats = response_cache.stats()
+st.sidebar.caption(f"Milo answer cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses ({cache_stats['entries']} entries)")
+
+# Send all queued localStorage writes
+localS.flush()
+end_rerun()
@@ -1,69 +1,66 @@
 import streamlit as st
-import pandas as pd
 import json
 import os
-from langchain_groq import ChatGroq
-from langchain_core.prompts import PromptTemplate
 from dotenv import load_dotenv
-from streamlit_local_storage import LocalStorage
+from strengthai.storage import get_storage
 from datetime import datetime
+from strengthai.pr_index import get_pr_index, pr_frame
+from strengthai.session_store import load_sessions
+from strengthai.planner import DEFAULT_QUERY, cached_plan, current_plan, plan_request_key, remember_plan
+from strengthai.plan_context import DEFAULT_TOKEN_BUDGET, build_plan_context
+from strengthai.llm import get_llm
+from strengthai.streaming import stream_text, write_stream
+from strengthai.tracing import begin_rerun, end_rerun, span
 
 # Load env vars
 dotenv_path = os.path.join(os.getcwd(), ".env")
 load_dotenv(dotenv_path)
 groq_api_key = os.getenv("GROQ_API_KEY")
 
-# LLM Setup
-llm = ChatGroq(
-    groq_api_key=groq_api_key,
-    model="llama-3.1-8b-instant"
-)
-
+begin_rerun("Planner")
 st.title("📅 Personalized Training Planner")
 st.markdown("Milo will create today's plan using your PRs and (optionally) injury history.")
 
 # Check for injury usage
 use_injury = st.checkbox("📌 Use Injury History from Ask Milo", value=True)
+token_budget = st.sidebar.number_input("Context token budget", min_value=100, max_value=4000,
+                                       value=DEFAULT_TOKEN_BUDGET, step=50)
 
-localS = LocalStorage()
+localS = get_storage()
 
-# Helper: Get best PRs from workout_sessions
-sessions = localS.getItem('workout_sessions')
-if not sessions or not isinstance(sessions, list):
-    sessions = []
-best_records = {}
-for session in sessions:
-    for ex, sets in session.get("exercises", {}).items():
-        for s in sets:
-            one_rm = round(s["Weight"] * (1 + (s["Reps"] + (10 - s["RPE"])) / 30), 2)
-            prev_best = best_records[ex]["Est. 1RM"] if ex in best_records and "Est. 1RM" in best_records[ex] else -float('inf')
-            if ex not in best_records or one_rm > prev_best:
-                best_records[ex] = {
-                    "Exercise": ex,
-                    "Best 1RM": one_rm,
-                    "Est. 1RM": one_rm,
-                    "Max Weight": s["Weight"],
-                    "Max Reps": s["Reps"],
-                    "Max RPE": s["RPE"]
-                }
-pr_df = pd.DataFrame(list(best_records.values())) if best_records else pd.DataFrame({"Exercise":[],"Best 1RM":[],"Max Weight":[],"Max Reps":[],"Max RPE":[]})
-pr_summary = pr_df.to_string(index=False)
+# Helper: Get best PRs from the PR index (full history is only read on a rebuild)
+with span("analytics.prs"):
+    pr_df = pr_frame(get_pr_index(localS, lambda: load_sessions(localS)))
 
 # Helper: Get latest injury from localStorage
-latest_injury = localS.getItem('latest_injury')
-if not latest_injury or not isinstance(latest_injury, dict):
-    latest_injury = None
-injury_summary = ""
-if use_injury and latest_injury:
-    injury_summary = f"\nUser reports injury: {latest_injury.get('query','')}\n\nTests: {latest_injury.get('tests','')}\n\nFindings: {latest_injury.get('test_results','')}\n\nRecommendations: {latest_injury.get('response','')}"
+latest_injury = localS.get_dict('latest_injury') if use_injury else None
+
+# Chat-based input. The form only submits on the button (or Enter), so
+# toggling the injury checkbox or other widgets never re-runs the model.
+with st.form("plan_form"):
+    user_query = st.text_input("💬 Ask Milo for today's training plan", placeholder="e.g., Give me today's squat plan")
+    submitted = st.form_submit_button("🛠️ Generate Plan")
+
+query_text = user_query if user_query else DEFAULT_QUERY
 
-# Chat-based input
-user_query = st.text_input("💬 Ask Milo for today's training plan", placeholder="e.g., Give me today's squat plan")
+# Only the PRs and injury facts most relevant to the query, within the budget
+with span("analytics.context"):
+    plan_context = build_plan_context(pr_df.to_dict("records"), latest_injury, query_text, token_budget)
+st.caption(f"Context: {plan_context.tokens} tokens (budget {token_budget}) · "
+           f"{plan_context.prs_used}/{plan_context.prs_total} PRs · "
+           f"{plan_context.facts_used}/{plan_context.facts_total} injury notes")
+# Keyed on the PRs and injury themselves, not the budgeted rendering of them
+pr_summary = pr_df.to_string(index=False)
+injury_summary = json.dumps(latest_injury, sort_keys=True) if latest_injury else ""
+request_key = plan_request_key(pr_summary, injury_summary, query_text)
 
-if st.button("🛠️ Generate Plan") or user_query:
-    system_prompt = PromptTemplate(
-        input_variables=["context"],
-        template="""
+if submitted and cached_plan(st.session_state, request_key):
+    # Same PRs, injury context and query as an earlier plan: reuse it
+    remember_plan(st.session_state, request_key, cached_plan(st.session_state, request_key))
+    st.subheader("🏋️ Milo's Plan for Today")
+    st.markdown(cached_plan(st.session_state, request_key)['plan'])
+elif submitted:
+    system_prompt = """
                 You are a powerlifting coach named Milo. Based on the context below, respond to the user's specific query.
                 Write in first person with the user.
                 Include warm-ups, working sets, reps, weights  (based on their PRs), and target RPE.
@@ -72,25 +69,29 @@ if st.button("🛠️ Generate Plan") or user_query:
                 Context:
                 {context}
                 """
-    )
 
-    query_text = user_query if user_query else "Give me today's full training plan"
-    full_context = f"{pr_summary}\n\n{injury_summary}\n\nUser query: {query_text}"
+    full_context = f"{plan_context.text}\n\nUser query: {query_text}"
     prompt = system_prompt.format(context=full_context)
-    response = llm.invoke(prompt)
 
     st.subheader("🏋️ Milo's Plan for Today")
-    st.markdown(response.content if hasattr(response, 'content') else str(response))
+    plan_text = write_stream(stream_text(get_llm(groq_api_key), prompt))
 
-    # Save plan to localStorage
-    plan_history = localS.getItem('plan_history')
-    if not plan_history or not isinstance(plan_history, list):
-        plan_history = []
+    # Save plan to localStorage once the stream has completed
+    plan_history = localS.get_list('plan_history')
     plan_entry = {
         'timestamp': str(datetime.now()),
         'query': query_text,
-        'plan': response.content if hasattr(response, 'content') else str(response)
+        'plan': plan_text
     }
     plan_history.append(plan_entry)
     localS.setItem('plan_history', plan_history, key='plan_history')
     localS.setItem('latest_plan', plan_entry, key='latest_plan')
+    remember_plan(st.session_state, request_key, plan_entry)
+elif current_plan(st.session_state):
+    # Any other rerun just re-displays the last plan
+    st.subheader("🏋️ Milo's Plan for Today")
+    st.markdown(current_plan(st.session_state)['plan'])
+
+# Send all queued localStorage writes
+localS.flush()
+end_rerun()
@@ -1,8 +1,13 @@
 import streamlit as st
 import pandas as pd
-from streamlit_local_storage import LocalStorage
+from strengthai.storage import get_storage
 from datetime import datetime
 import json
+from strengthai import analytics
+from strengthai.session_store import load_session, load_sessions, session_count
+from strengthai.columnar import columnar_backend
+from strengthai.pagination import paginate
+from strengthai.tracing import begin_rerun, end_rerun, span
 
 def format_dt(dt_str):
     try:
@@ -19,57 +24,89 @@ def calc_duration(start_str, end_str):
     except Exception:
         return "-"
 
+# One table row per session; set-level tables are only built for the session
+# the user opens
+def summary_rows(summary):
+    return pd.DataFrame({
+        "Session #": summary["Session"],
+        "Start": [format_dt(s) for s in summary["Start"]],
+        "Duration": [calc_duration(s, e) for s, e in zip(summary["Start"], summary["End"])],
+        "Exercises": summary["Exercises"],
+        "Sets": summary["Sets"],
+        "Volume": summary["Volume"].round(1),
+        "Best 1RM": summary["Best 1RM"],
+        "Weight Type": summary["Weight Type"],
+    })
+
+# Summary rows are kept in st.session_state and only rebuilt when the stored
+# session count changes, so paging doesn't rescan the whole history
+def stored_summary(localS):
+    count = session_count(localS)
+    cached = st.session_state.get("history_summary")
+    if cached is None or cached[0] != count:
+        with span("storage.sessions"):
+            sessions = load_sessions(localS)
+        with span("analytics.summary"):
+            cached = st.session_state["history_summary"] = (count, analytics.session_summary(sessions))
+    return cached[1]
+
+def show_session(session, number):
+    st.markdown(f"#### 🗓️ Session #{number}")
+    st.markdown(f"**Weight Type:** {session.get('weight_type','kg')}")
+    st.markdown(f"**Start:** {format_dt(session.get('start_time',''))}")
+    st.markdown(f"**End:** {format_dt(session.get('end_time',''))}")
+    for ex, sets in session.get("exercises", {}).items():
+        st.subheader(f"🏋️ {ex}")
+        if sets:
+            set_df = pd.DataFrame(sets)
+            set_df = analytics.add_set_metrics(set_df)
+            st.dataframe(set_df, use_container_width=True)
+        else:
+            st.write("No sets logged for this exercise.")
+
 st.set_page_config(page_title="📂 Workout History", layout="wide")
+begin_rerun("History")
 st.title("📂 Workout History")
 
-localS = LocalStorage()
-SESSIONS_KEY = "workout_sessions"
-sessions = localS.getItem(SESSIONS_KEY)
-if not sessions or not isinstance(sessions, list):
-    sessions = []
-injury_history = localS.getItem('injury_history')
-if not injury_history or not isinstance(injury_history, list):
-    injury_history = []
-plan_history = localS.getItem('plan_history')
-if not plan_history or not isinstance(plan_history, list):
-    plan_history = []
+localS = get_storage()
+backend = columnar_backend()
+if backend is not None:
+    with span("analytics.summary"):
+        summary = backend.session_summary()
+else:
+    summary = stored_summary(localS)
+injury_history = localS.get_list('injury_history')
+plan_history = localS.get_list('plan_history')
 
 # Tabs for different histories of user
 st.header('History')
 tabs = st.tabs(["Workout Sessions", "Injury History", "Plan History"])
 
 with tabs[0]:
-    if not sessions:
+    if summary.empty:
         st.warning("No workout sessions found. Start logging to see your history!")
     else:
-        for i, session in enumerate(reversed(sessions)):
-            start = format_dt(session.get('start_time',''))
-            end = format_dt(session.get('end_time',''))
-            duration = calc_duration(session.get('start_time',''), session.get('end_time',''))
-            exercises = list(session.get('exercises', {}).keys())
-            n_sets = sum(len(sets) for sets in session.get('exercises', {}).values())
-            header = f"🗓️  Session #{len(sessions)-i} | 🕒 {start} | ⏱️ {duration} | 🏋️ {len(exercises)} exercises, {n_sets} sets"
-            with st.expander(header):
-                st.markdown(f"**Weight Type:** {session.get('weight_type','kg')}")
-                st.markdown(f"**Start:** {start}")
-                st.markdown(f"**End:** {end}")
-                for ex, sets in session.get("exercises", {}).items():
-                    st.subheader(f"🏋️ {ex}")
-                    if sets:
-                        set_df = pd.DataFrame(sets)
-                        set_df["Volume"] = set_df["Weight"] * set_df["Reps"]
-                        set_df["Est. 1RM"] = set_df.apply(lambda row: round(row["Weight"] * (1 + (row["Reps"] + (10 - row["RPE"])) / 30), 2), axis=1)
-                        st.dataframe(set_df, use_container_width=True)
-                    else:
-                        st.write("No sets logged for this exercise.")
+        start, stop = paginate(len(summary), key="session_page")
+        page = summary_rows(summary.iloc[start:stop].iloc[::-1])
+        st.dataframe(page, use_container_width=True, hide_index=True)
+        numbers = page["Session #"].tolist()
+        number = st.selectbox("Open session", [None] + numbers,
+                              format_func=lambda n: "—" if n is None else f"Session #{n}",
+                              key="open_session")
+        if number is not None:
+            session = backend.session(number - 1) if backend is not None else load_session(localS, number - 1)
+            with span("analytics.session"):
+                show_session(session, number)
 
 with tabs[1]:
     if not injury_history:
         st.info("No injury history found.")
     else:
-        for i, entry in enumerate(reversed(injury_history)):
+        start, stop = paginate(len(injury_history), key="injury_page")
+        for i in reversed(range(start, stop)):
+            entry = injury_history[i]
             date_str = format_dt(entry.get('date', '')) if 'date' in entry else ''
-            header = f"Injury #{len(injury_history)-i} | Query: {entry.get('query','')}"
+            header = f"Injury #{i+1} | Query: {entry.get('query','')}"
             if date_str:
                 header += f" | {date_str}"
             with st.expander(header):
@@ -81,12 +118,18 @@ with tabs[2]:
     if not plan_history:
         st.info("No plan history found.")
     else:
-        for i, entry in enumerate(reversed(plan_history)):
+        start, stop = paginate(len(plan_history), key="plan_page")
+        for i in reversed(range(start, stop)):
+            entry = plan_history[i]
             timestamp = format_dt(entry.get('timestamp',''))
-            with st.expander(f"Plan #{len(plan_history)-i} | {timestamp}"):
+            with st.expander(f"Plan #{i+1} | {timestamp}"):
                 st.markdown(f"**Query:** {entry.get('query','')}")
                 st.markdown(f"**Plan:**")
                 st.markdown(entry.get('plan',''))
 
 st.markdown('---')
-st.info('To backup or restore your data, please use the "💾 Backup & Restore" page.') 
\ No newline at end of file
+st.info('To backup or restore your data, please use the "💾 Backup & Restore" page.')
+
+# Send all queued localStorage writes
+localS.flush()
+end_rerun()
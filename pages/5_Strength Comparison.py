@@ -1,20 +1,20 @@
 import streamlit as st
 import pandas as pd
-import os
-from streamlit_local_storage import LocalStorage
+from strengthai.storage import get_storage
 from datetime import datetime
+from strengthai.pr_index import get_pr_index, pr_frame
+from strengthai.session_store import load_sessions
+from strengthai.columnar import columnar_backend
+from strengthai.catalog import COMPARE_TYPES, GENDERS, UNITS, load_catalog
+from strengthai.standards import rate, rate_many
+from strengthai.tracing import begin_rerun, end_rerun, span
 
 st.set_page_config(page_title="🏋️ Strength Comparison", layout="wide")
+begin_rerun("Strength Comparison")
 st.title("🏋️ Strength Comparison")
 
 # --- Helper functions ---
-COMPARISON_PATH = "comparison data"
-GENDERS = ["male", "female"]
-UNITS = ["kg", "lb"]
-COMPARE_TYPES = ["age", "bodyweight"]
-
 # Map for display
-LEVELS = ["Beg.", "Nov.", "Int.", "Adv.", "Elite"]
 LEVEL_DESC = {
     "Beg.": "Beginner: Stronger than 5% of lifters.",
     "Nov.": "Novice: Stronger than 20% of lifters.",
@@ -23,68 +23,23 @@ LEVEL_DESC = {
     "Elite": "Elite: Stronger than 95% of lifters."
 }
 
-# Get available exercises
-EXERCISES = []
-for g in GENDERS:
-    for u in UNITS:
-        for c in COMPARE_TYPES:
-            d = os.path.join(COMPARISON_PATH, g, u, c)
-            if os.path.exists(d):
-                for f in os.listdir(d):
-                    if f.endswith('.csv'):
-                        ex = f.replace('.csv','').replace('-', ' ').title()
-                        if ex not in EXERCISES:
-                            EXERCISES.append(ex)
-EXERCISES.sort()
-
-# --- Load user bests ---
-def get_user_bests():
-    localS = LocalStorage()
-    sessions = localS.getItem("workout_sessions")
-    if not sessions or not isinstance(sessions, list):
-        return {}
-    bests = {}
-    for session in sessions:
-        for ex, sets in session.get("exercises", {}).items():
-            for s in sets:
-                one_rm = round(s["Weight"] * (1 + (s["Reps"] + (10 - s["RPE"])) / 30), 2)
-                if ex not in bests or one_rm > bests[ex]["Est. 1RM"]:
-                    bests[ex] = {
-                        "Exercise": ex,
-                        "Est. 1RM": one_rm,
-                        "Weight": s["Weight"],
-                        "Reps": s["Reps"],
-                        "RPE": s["RPE"],
-                        "Session": session
-                    }
-    return bests
+# Available exercises (catalog is built once per process)
+catalog = load_catalog()
+EXERCISES = catalog.display_names()
 
-# --- Lookup function ---
-def lookup_level(gender, unit, compare_type, exercise, value, age=None, bw=None):
-    ex_file = exercise.lower().replace(' ', '-') + ".csv"
-    path = os.path.join(COMPARISON_PATH, gender, unit, compare_type, ex_file)
-    if not os.path.exists(path):
-        return None, None
-    df = pd.read_csv(path)
-    if compare_type == "age":
-        if age is None:
-            return None, None
-        # Find closest age row
-        row = df.iloc[(df["Age"]-age).abs().argsort()[:1]]
-    else:
-        if bw is None:
-            return None, None
-        row = df.iloc[(df["BW"]-bw).abs().argsort()[:1]]
-    row = row.iloc[0]
-    for lvl in LEVELS:
-        if value < row[lvl]:
-            idx = LEVELS.index(lvl)
-            return LEVELS[max(0, idx-1)], row
-    return LEVELS[-1], row
+# --- Load user bests (from the PR index, for the selected unit) ---
+def get_user_bests(unit):
+    backend = columnar_backend()
+    if backend is not None:
+        pr_df = backend.personal_bests()
+        pr_df = pr_df[pr_df["Weight Type"] == unit]
+        return {row["Exercise"]: row for row in pr_df.to_dict("records")}
+    pr_df = pr_frame(get_pr_index(localS, lambda: load_sessions(localS)), unit=unit)
+    return {row["Exercise"]: {**row, "Est. 1RM": row["Best 1RM"]} for row in pr_df.to_dict("records")}
 
 # --- Get default age/bodyweight from body stats ---
-localS = LocalStorage()
-stats = localS.getItem('body_stats')
+localS = get_storage()
+stats = localS.get_list('body_stats')
 def get_latest_stat(stats, field):
     if stats and isinstance(stats, list):
         # Use the most recent entry (by date)
@@ -107,25 +62,32 @@ unit = st.selectbox("Units", UNITS, key="auto_unit")
 default_compare_type = 1  # index of 'bodyweight' in COMPARE_TYPES
 compare_type = st.selectbox("Compare by", COMPARE_TYPES, index=default_compare_type, key="auto_compare_type")
 
-bests = get_user_bests()
+with span("analytics.prs"):
+    bests = get_user_bests(unit)
 if not bests:
     st.info("No workout data found. Log some sessions first!")
 else:
     age = st.number_input("Your Age", min_value=10, max_value=100, value=def_age) if compare_type=="age" else None
     bw = st.number_input("Your Bodyweight", min_value=20.0, max_value=200.0, value=float(def_bw)) if compare_type=="bodyweight" else None
-    table = []
+    # Match logged exercises to the standards, then rate them all in one call
+    matched = []
     for ex in bests:
-        # Try to match exercise name
-        ex_file = ex.lower().replace(' ', '-')
-        match = [e for e in EXERCISES if e.lower().replace(' ', '-')==ex_file]
-        if not match:
-            continue
-        level, row = lookup_level(gender, unit, compare_type, match[0], bests[ex]["Est. 1RM"], age, bw)
+        slug = catalog.resolve(ex)
+        if slug:
+            matched.append((ex, catalog.display_name(slug)))
+    with span("analytics.levels"):
+        ratings = rate_many(gender, unit, compare_type,
+                            [name for _, name in matched],
+                            [bests[ex]["Est. 1RM"] for ex, _ in matched],
+                            age if compare_type=="age" else bw)
+    table = []
+    for (ex, name), rating in zip(matched, ratings):
         table.append({
-            "Exercise": match[0],
+            "Exercise": name,
             "Your Best 1RM": bests[ex]["Est. 1RM"],
-            "Level": level or "-",
-            "Description": LEVEL_DESC.get(level, "-") if level else "-"
+            "Level": rating.level if rating else "-",
+            "Percentile": rating.percentile if rating else None,
+            "Description": LEVEL_DESC.get(rating.level, "-") if rating else "-"
         })
     if table:
         st.dataframe(pd.DataFrame(table))
@@ -146,13 +108,15 @@ with col2:
     man_bw = st.number_input("Your Bodyweight", min_value=20.0, max_value=200.0, value=float(def_bw), key="man_bw") if man_compare_type=="bodyweight" else None
 
 if st.button("Check Level"):
-    level, row = lookup_level(man_gender, man_unit, man_compare_type, man_ex, man_val, man_age, man_bw)
-    if level:
-        st.success(f"Level: {level} — {LEVEL_DESC.get(level, '-')}")
-        if row is not None:
-            st.markdown("**Reference Standards for Your Input:**")
-            st.table(pd.DataFrame([row.to_dict()]))
-        else:
-            st.info("No reference row found.")
+    rating = rate(man_gender, man_unit, man_compare_type, man_ex, man_val,
+                  man_age if man_compare_type=="age" else man_bw)
+    if rating:
+        st.success(f"Level: {rating.level} — {LEVEL_DESC.get(rating.level, '-')} (stronger than ~{rating.percentile:g}% of lifters)")
+        st.markdown("**Reference Standards for Your Input:**")
+        st.table(pd.DataFrame([rating.row]))
     else:
-        st.warning("Could not determine level for the given input.") 
\ No newline at end of file
+        st.warning("Could not determine level for the given input.")
+
+# Send all queued localStorage writes
+localS.flush()
+end_rerun()
@@ -1,17 +1,17 @@
 import streamlit as st
 import pandas as pd
 import json
-from streamlit_local_storage import LocalStorage
+from strengthai.storage import get_storage
+from strengthai.tracing import begin_rerun, end_rerun
 from datetime import datetime
 
 st.set_page_config(page_title="🧑‍💼 Body Stats", layout="wide")
+begin_rerun("Body Stats")
 st.title("🧑‍💼 Body Stats Tracker")
 
-localS = LocalStorage()
+localS = get_storage()
 STATS_KEY = "body_stats"
-stats = localS.getItem(STATS_KEY)
-if not stats or not isinstance(stats, list):
-    stats = []
+stats = localS.get_list(STATS_KEY)
 
 # --- Add/Edit Body Stat ---
 st.header("Add/Update Body Stat Entry")
@@ -49,4 +49,8 @@ else:
     st.info("No body stats found. Add your first entry above!")
 
 st.markdown('---')
-st.info('To backup or restore your data, please use the "💾 Backup & Restore" page.')
\ No newline at end of file
+st.info('To backup or restore your data, please use the "💾 Backup & Restore" page.')
+
+# Send all queued localStorage writes
+localS.flush()
+end_rerun()
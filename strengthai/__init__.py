@@ -0,0 +1 @@
+# Shared, page-independent building blocks for the StrengthAI Streamlit app.
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+# Columns of the flattened per-set table
+SET_COLUMNS = ["Session", "Start", "Weight Type", "Exercise", "Set", "Weight", "Reps", "RPE", "Volume", "Est. 1RM"]
+PR_COLUMNS = ["Exercise", "Best 1RM", "Est. 1RM", "Max Weight", "Max Reps", "Max RPE", "Weight Type"]
+SUMMARY_COLUMNS = ["Session", "Start", "End", "Weight Type", "Exercises", "Sets", "Volume", "Best 1RM"]
+
+
+# Est. 1RM = Weight * (1 + (Reps + RIR) / 30), with RIR = 10 - RPE
+def est_1rm(weight, reps, rpe):
+    weight = np.asarray(weight, dtype=float)
+    reps = np.asarray(reps, dtype=float)
+    rpe = np.asarray(rpe, dtype=float)
+    return np.round(weight * (1 + (reps + (10 - rpe)) / 30), 2)
+
+
+# Add Volume / Est. 1RM columns to a frame of raw sets (Weight, Reps, RPE)
+def add_set_metrics(set_df):
+    set_df["Volume"] = set_df["Weight"] * set_df["Reps"]
+    set_df["Est. 1RM"] = est_1rm(set_df["Weight"], set_df["Reps"], set_df["RPE"])
+    return set_df
+
+
+# Flatten workout_sessions into one columnar table, one row per logged set
+def set_table(sessions):
+    sessions = sessions or []
+    session_idx, exercises, set_no = [], [], []
+    weights, reps, rpes = [], [], []
+    for i, session in enumerate(sessions):
+        for ex, sets in session.get("exercises", {}).items():
+            for j, s in enumerate(sets):
+                session_idx.append(i)
+                exercises.append(ex)
+                set_no.append(j + 1)
+                weights.append(s["Weight"])
+                reps.append(s["Reps"])
+                rpes.append(s["RPE"])
+
+    session_idx = np.asarray(session_idx, dtype=np.int64)
+    starts = np.asarray([s.get("start_time", "") for s in sessions], dtype=object)
+    units = np.asarray([s.get("weight_type", "kg") for s in sessions], dtype=object)
+    weights = np.asarray(weights, dtype=float)
+    reps = np.asarray(reps)
+    rpes = np.asarray(rpes)
+
+    return pd.DataFrame({
+        "Session": session_idx,
+        "Start": starts[session_idx] if len(sessions) else np.asarray([], dtype=object),
+        "Weight Type": units[session_idx] if len(sessions) else np.asarray([], dtype=object),
+        "Exercise": np.asarray(exercises, dtype=object),
+        "Set": np.asarray(set_no, dtype=np.int64),
+        "Weight": weights,
+        "Reps": reps,
+        "RPE": rpes,
+        "Volume": weights * reps,
+        "Est. 1RM": est_1rm(weights, reps, rpes),
+    }, columns=SET_COLUMNS)
+
+
+# Best set per exercise (highest Est. 1RM, first occurrence wins on ties)
+def personal_bests(table, by=("Exercise",)):
+    if table.empty:
+        return pd.DataFrame(columns=PR_COLUMNS)
+    best_idx = table.groupby(list(by), sort=False)["Est. 1RM"].idxmax()
+    best = table.loc[best_idx.to_numpy()]
+    return pd.DataFrame({
+        "Exercise": best["Exercise"].to_numpy(),
+        "Best 1RM": best["Est. 1RM"].to_numpy(),
+        "Est. 1RM": best["Est. 1RM"].to_numpy(),
+        "Max Weight": best["Weight"].to_numpy(),
+        "Max Reps": best["Reps"].to_numpy(),
+        "Max RPE": best["RPE"].to_numpy(),
+        "Weight Type": best["Weight Type"].to_numpy(),
+    }, columns=PR_COLUMNS)
+
+
+# One row per session with set counts, total volume and best Est. 1RM
+def session_summary(sessions, table=None):
+    sessions = sessions or []
+    if table is None:
+        table = set_table(sessions)
+    grouped = table.groupby("Session")
+    agg = pd.DataFrame({
+        "Sets": grouped.size(),
+        "Volume": grouped["Volume"].sum(),
+        "Best 1RM": grouped["Est. 1RM"].max(),
+    }).reindex(range(len(sessions)))
+    summary = pd.DataFrame({
+        "Session": np.arange(1, len(sessions) + 1),
+        "Start": [s.get("start_time", "") for s in sessions],
+        "End": [s.get("end_time", "") for s in sessions],
+        "Weight Type": [s.get("weight_type", "kg") for s in sessions],
+        # Count exercises from the session itself so empty exercises still show
+        "Exercises": [len(s.get("exercises", {})) for s in sessions],
+        "Sets": agg["Sets"].fillna(0).astype(int).to_numpy(),
+        "Volume": agg["Volume"].fillna(0.0).to_numpy(),
+        "Best 1RM": agg["Best 1RM"].to_numpy(),
+    }, columns=SUMMARY_COLUMNS)
+    return summary
@@ -0,0 +1,72 @@
+import os
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+# Exercise catalog for the strength standards. The `comparison data/` tree
+# is walked once per process; lookups from logger names, aliases or slugs
+# are then O(1) dict hits.
+COMPARISON_PATH = "comparison data"
+GENDERS = ["male", "female"]
+UNITS = ["kg", "lb"]
+COMPARE_TYPES = ["age", "bodyweight"]
+
+# Names used by the Workout Logger (or commonly typed) -> standards slug
+ALIASES = {
+    "bench": "bench-press",
+    "flat bench press": "bench-press",
+    "barbell bench press": "bench-press",
+    "back squat": "squat",
+    "barbell squat": "squat",
+    "conventional deadlift": "deadlift",
+    "barbell deadlift": "deadlift",
+    "bicep curl": "barbell-curl",
+    "biceps curl": "barbell-curl",
+    "barbell bicep curl": "barbell-curl",
+    "curl": "barbell-curl",
+    "overhead press": "shoulder-press",
+    "ohp": "shoulder-press",
+    "military press": "shoulder-press",
+    "barbell row": "bent-over-row",
+    "bent over barbell row": "bent-over-row",
+    "clean": "power-clean",
+}
+
+
+def normalize_name(name):
+    return re.sub(r"\s+", " ", re.sub(r"[-_]", " ", name.strip().lower()))
+
+
+class ExerciseCatalog(NamedTuple):
+    names: dict      # slug -> display name
+    files: dict      # slug -> {(gender, unit, compare_type): csv path}
+    lookup: dict     # normalized name / alias -> slug
+
+    def resolve(self, name):
+        return self.lookup.get(normalize_name(name))
+
+    def display_name(self, slug):
+        return self.names.get(slug)
+
+    def display_names(self):
+        return sorted(self.names.values())
+
+
+@lru_cache(maxsize=None)
+def load_catalog(root=COMPARISON_PATH):
+    names, files = {}, {}
+    for g in GENDERS:
+        for u in UNITS:
+            for c in COMPARE_TYPES:
+                d = os.path.join(root, g, u, c)
+                if not os.path.isdir(d):
+                    continue
+                for f in os.listdir(d):
+                    if f.endswith('.csv'):
+                        slug = f[:-len('.csv')]
+                        names.setdefault(slug, slug.replace('-', ' ').title())
+                        files.setdefault(slug, {})[(g, u, c)] = os.path.join(d, f)
+    lookup = {normalize_name(slug): slug for slug in names}
+    lookup.update({normalize_name(name): slug for slug, name in names.items()})
+    lookup.update({alias: slug for alias, slug in ALIASES.items() if slug in names})
+    return ExerciseCatalog(names, files, lookup)
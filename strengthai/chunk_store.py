@@ -0,0 +1,91 @@
+import argparse
+import json
+import mmap
+import os
+import pickle
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_community.docstore.base import Docstore
+
+# Memory-mapped docstore for Milo's chunks, replacing the pickled index.pkl.
+# chunks.bin holds one compact JSON record per chunk back to back, and
+# chunk_offsets.npy holds n + 1 byte offsets into it, so chunk i is
+# blob[offsets[i]:offsets[i + 1]]. Loading maps both files and parses nothing;
+# a query decodes only the k chunks it returns. Docstore ids are the FAISS row
+# numbers as strings, as written by strengthai.milo_index.
+CHUNKS_FILE = "chunks.bin"
+OFFSETS_FILE = "chunk_offsets.npy"
+
+
+def has_chunk_store(path):
+    return os.path.exists(os.path.join(path, OFFSETS_FILE))
+
+
+def write_chunk_store(docs, path):
+    offsets = [0]
+    with open(os.path.join(path, CHUNKS_FILE), "wb") as f:
+        for doc in docs:
+            record = json.dumps({"page_content": doc.page_content, "metadata": doc.metadata},
+                                separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+            f.write(record)
+            offsets.append(offsets[-1] + len(record))
+    np.save(os.path.join(path, OFFSETS_FILE), np.asarray(offsets, dtype=np.int64))
+
+
+class ChunkStore(Docstore):
+    def __init__(self, path):
+        self.path = path
+        self.offsets = np.load(os.path.join(path, OFFSETS_FILE), mmap_mode="r")
+        self._blob = None
+        if self.offsets[-1] > 0:
+            with open(os.path.join(path, CHUNKS_FILE), "rb") as f:
+                self._blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    # Chunk by FAISS row number
+    def get(self, i):
+        record = json.loads(self._blob[int(self.offsets[i]):int(self.offsets[i + 1])])
+        return Document(page_content=record["page_content"], metadata=record["metadata"])
+
+    # Docstore interface used by LangChain's FAISS wrapper
+    def search(self, search):
+        try:
+            i = int(search)
+        except (TypeError, ValueError):
+            i = -1
+        if not 0 <= i < len(self):
+            return f"ID {search} not found."
+        return self.get(i)
+
+    # FAISS row -> docstore id mapping matching this store
+    def index_to_docstore_id(self):
+        return {i: str(i) for i in range(len(self))}
+
+
+# One-off migration of an index.pkl docstore (notebook builds) to a chunk
+# store, keeping the FAISS row order
+def convert_pickle(path, remove=False):
+    pkl_path = os.path.join(path, "index.pkl")
+    with open(pkl_path, "rb") as f:
+        docstore, index_to_docstore_id = pickle.load(f)
+    docs = [docstore.search(index_to_docstore_id[i]) for i in range(len(index_to_docstore_id))]
+    write_chunk_store(docs, path)
+    if remove:
+        os.remove(pkl_path)
+    return len(docs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert a pickled FAISS docstore to a chunk store.")
+    parser.add_argument("index", help="Index directory containing index.pkl")
+    parser.add_argument("--remove-pickle", action="store_true", help="Delete index.pkl afterwards")
+    args = parser.parse_args(argv)
+    n = convert_pickle(args.index, args.remove_pickle)
+    print(f"Wrote {n} chunks to {os.path.join(args.index, CHUNKS_FILE)}")
+
+
+if __name__ == "__main__":
+    main()
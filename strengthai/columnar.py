@@ -0,0 +1,236 @@
+import argparse
+import json
+import os
+import shutil
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from strengthai import analytics
+
+# Optional columnar on-disk backend for training history. A bundle is a
+# directory of typed .npy arrays (one value per logged set, sorted by
+# session) plus meta.json holding the exercise and unit dictionaries. Arrays
+# are opened memory-mapped, so readers only page in the columns they touch;
+# this is what lets a coach's dashboard scan many athletes' histories
+# without loading them all into RAM.
+#
+# Set STRENGTHAI_COLUMNAR_DIR to a bundle directory to have Home, History
+# and Strength Comparison read from it instead of browser localStorage.
+COLUMNAR_DIR_ENV = "STRENGTHAI_COLUMNAR_DIR"
+BUNDLE_VERSION = 1
+SET_COLUMNS = {
+    "session_id": np.int32,
+    "exercise_id": np.int32,
+    "unit_id": np.int8,
+    "weight": np.float32,
+    "reps": np.float32,
+    "rpe": np.float32,
+    "timestamp": np.int64,   # session start, epoch seconds (-1 if unknown)
+}
+UNITS = ["kg", "lb"]
+
+
+def _epoch(dt_str):
+    try:
+        return int(datetime.fromisoformat(dt_str).timestamp())
+    except (TypeError, ValueError):
+        return -1
+
+
+def _format_epoch(ts):
+    return datetime.fromtimestamp(int(ts)).isoformat() if ts >= 0 else ""
+
+
+# Write sessions to a bundle directory; the directory is swapped in
+# atomically so readers never see a half-written bundle
+def write_history(sessions, path):
+    exercises, exercise_ids = [], {}
+    units = list(UNITS)
+    cols = {name: [] for name in SET_COLUMNS}
+    starts, ends, session_units, session_exercises = [], [], [], []
+    for i, session in enumerate(sessions):
+        start = _epoch(session.get("start_time"))
+        unit = session.get("weight_type", "kg")
+        if unit not in units:
+            units.append(unit)
+        starts.append(start)
+        ends.append(_epoch(session.get("end_time")))
+        session_units.append(units.index(unit))
+        session_exercises.append(len(session.get("exercises", {})))
+        for ex, sets in session.get("exercises", {}).items():
+            if ex not in exercise_ids:
+                exercise_ids[ex] = len(exercises)
+                exercises.append(ex)
+            for s in sets:
+                cols["session_id"].append(i)
+                cols["exercise_id"].append(exercise_ids[ex])
+                cols["unit_id"].append(units.index(unit))
+                cols["weight"].append(s["Weight"])
+                cols["reps"].append(s["Reps"])
+                cols["rpe"].append(s["RPE"])
+                cols["timestamp"].append(start)
+
+    tmp_path = f"{path}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    for name, dtype in SET_COLUMNS.items():
+        np.save(os.path.join(tmp_path, f"{name}.npy"), np.asarray(cols[name], dtype=dtype))
+    np.save(os.path.join(tmp_path, "session_start.npy"), np.asarray(starts, dtype=np.int64))
+    np.save(os.path.join(tmp_path, "session_end.npy"), np.asarray(ends, dtype=np.int64))
+    np.save(os.path.join(tmp_path, "session_unit.npy"), np.asarray(session_units, dtype=np.int8))
+    np.save(os.path.join(tmp_path, "session_exercises.npy"), np.asarray(session_exercises, dtype=np.int32))
+    with open(os.path.join(tmp_path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "version": BUNDLE_VERSION,
+            "exercises": exercises,
+            "units": units,
+            "sessions": len(sessions),
+            "sets": len(cols["session_id"]),
+        }, f)
+
+    old_path = f"{path}.old"
+    if os.path.exists(path):
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+
+class ColumnarHistory:
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.exercises = np.asarray(self.meta["exercises"], dtype=object)
+        self.units = np.asarray(self.meta["units"], dtype=object)
+        self._columns = {}
+
+    def __len__(self):
+        return self.meta["sessions"]
+
+    # Memory-mapped column, opened on first access
+    def column(self, name):
+        if name not in self._columns:
+            self._columns[name] = np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode="r")
+        return self._columns[name]
+
+    # Per-set table in analytics.set_table's layout, building only the
+    # requested columns
+    def set_table(self, columns=None, rows=None):
+        columns = columns or analytics.SET_COLUMNS
+        rows = slice(None) if rows is None else rows
+        sid = self.column("session_id")[rows]
+        out = {}
+        for name in columns:
+            if name == "Session":
+                out[name] = np.asarray(sid, dtype=np.int64)
+            elif name == "Start":
+                out[name] = np.asarray([_format_epoch(t) for t in self.column("session_start")], dtype=object)[sid]
+            elif name == "Weight Type":
+                out[name] = self.units[self.column("unit_id")[rows]]
+            elif name == "Exercise":
+                out[name] = self.exercises[self.column("exercise_id")[rows]]
+            elif name == "Set":
+                out[name] = _set_numbers(sid, self.column("exercise_id")[rows])
+            elif name == "Weight":
+                out[name] = np.asarray(self.column("weight")[rows], dtype=float)
+            elif name == "Reps":
+                out[name] = np.asarray(self.column("reps")[rows], dtype=float)
+            elif name == "RPE":
+                out[name] = np.asarray(self.column("rpe")[rows], dtype=float)
+            elif name == "Volume":
+                out[name] = np.asarray(self.column("weight")[rows], dtype=float) * self.column("reps")[rows]
+            elif name == "Est. 1RM":
+                out[name] = analytics.est_1rm(self.column("weight")[rows], self.column("reps")[rows], self.column("rpe")[rows])
+        return pd.DataFrame(out, columns=list(columns))
+
+    # Best set per (exercise, unit), like the PR index: kg and lb are never
+    # compared with each other
+    def personal_bests(self):
+        table = self.set_table(["Exercise", "Weight Type", "Weight", "Reps", "RPE", "Est. 1RM"])
+        return analytics.personal_bests(table, by=("Exercise", "Weight Type"))
+
+    # Rows of one session (0-based), found by binary search on session_id
+    def session_rows(self, session_idx):
+        sid = self.column("session_id")
+        return slice(int(np.searchsorted(sid, session_idx, "left")), int(np.searchsorted(sid, session_idx, "right")))
+
+    # Rebuild one session in the localStorage dict layout
+    def session(self, session_idx):
+        table = self.set_table(["Exercise", "Weight", "Reps", "RPE"], rows=self.session_rows(session_idx))
+        exercises = {}
+        for row in table.to_dict("records"):
+            exercises.setdefault(row["Exercise"], []).append({"Weight": row["Weight"], "Reps": row["Reps"], "RPE": row["RPE"]})
+        return {
+            "start_time": _format_epoch(self.column("session_start")[session_idx]),
+            "end_time": _format_epoch(self.column("session_end")[session_idx]),
+            "weight_type": str(self.units[self.column("session_unit")[session_idx]]),
+            "exercises": exercises,
+        }
+
+    # Same layout as analytics.session_summary, computed with bincount over
+    # the mapped columns
+    def session_summary(self):
+        n = len(self)
+        sid = np.asarray(self.column("session_id"), dtype=np.int64)
+        volume = np.asarray(self.column("weight"), dtype=float) * self.column("reps")
+        one_rm = analytics.est_1rm(self.column("weight"), self.column("reps"), self.column("rpe"))
+        best = np.full(n, np.nan)
+        if len(sid):
+            np.fmax.at(best, sid, one_rm)
+        return pd.DataFrame({
+            "Session": np.arange(1, n + 1),
+            "Start": [_format_epoch(t) for t in self.column("session_start")],
+            "End": [_format_epoch(t) for t in self.column("session_end")],
+            "Weight Type": self.units[self.column("session_unit")],
+            "Exercises": np.asarray(self.column("session_exercises")),
+            "Sets": np.bincount(sid, minlength=n),
+            "Volume": np.bincount(sid, weights=volume, minlength=n),
+            "Best 1RM": best,
+        }, columns=analytics.SUMMARY_COLUMNS)
+
+
+# 1-based set number within each (session, exercise) run
+def _set_numbers(session_id, exercise_id):
+    n = len(session_id)
+    if not n:
+        return np.asarray([], dtype=np.int64)
+    starts = np.ones(n, dtype=bool)
+    starts[1:] = (np.diff(session_id) != 0) | (np.diff(exercise_id) != 0)
+    run_start = np.maximum.accumulate(np.where(starts, np.arange(n), 0))
+    return np.arange(n) - run_start + 1
+
+
+# Bundle configured through STRENGTHAI_COLUMNAR_DIR, or None
+def columnar_backend():
+    path = os.environ.get(COLUMNAR_DIR_ENV)
+    if path and os.path.exists(os.path.join(path, "meta.json")):
+        return ColumnarHistory(path)
+    return None
+
+
+def main(argv=None):
+    from strengthai.backup import read_backup
+
+    parser = argparse.ArgumentParser(description="Build or inspect columnar training-history bundles.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Convert a StrengthAI backup into a bundle")
+    build.add_argument("backup")
+    build.add_argument("bundle")
+    prs = sub.add_parser("prs", help="Print personal bests for one or more bundles")
+    prs.add_argument("bundles", nargs="+")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        with open(args.backup, "rb") as f:
+            sessions = read_backup(f).get("workout_sessions", [])
+        write_history(sessions, args.bundle)
+        print(f"Wrote {len(sessions)} sessions to {args.bundle}")
+    else:
+        for path in args.bundles:
+            print(f"== {path}")
+            print(ColumnarHistory(path).personal_bests().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import argparse
+import json
+import math
+import os
+import re
+import time
+
+import numpy as np
+
+# Hybrid retrieval for Milo: a BM25 inverted index over the chunk text is
+# fused with the FAISS neighbours, so exact terms the embedding model blurs
+# ("Hawkins-Kennedy", "Neer's test") still surface. An optional cross-encoder
+# re-scores the fused candidates within a latency budget.
+#
+# The BM25 index is precomputed next to the FAISS index as CSR postings:
+# bm25_vocab.json (term -> row), bm25_indptr.npy, bm25_docs.npy and
+# bm25_weights.npy, where each posting's weight already includes idf and
+# length normalisation. Arrays are memory-mapped; a query just gathers and
+# sums the postings of its terms.
+BM25_K1 = 1.5
+BM25_B = 0.75
+CANDIDATES = 20        # per retriever, before fusion
+RRF_K = 60
+RERANK_BUDGET_MS = 150
+RERANK_BATCH = 4
+VOCAB_FILE = "bm25_vocab.json"
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have i if in into is it its me my of on or so that the
+their then there these they this to was were what when which who will with you your
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+# Lowercased word tokens; "Neer's" -> "neer", "Hawkins-Kennedy" -> hawkins, kennedy
+def tokenize(text):
+    return [t for t in _TOKEN_RE.findall((text or "").lower().replace("'s", "").replace("\u2019s", "")) if len(t) > 1 and t not in STOPWORDS]
+
+
+class BM25Index:
+    def __init__(self, vocab, indptr, docs, weights, n_docs):
+        self.vocab = vocab
+        self.indptr = indptr
+        self.docs = docs
+        self.weights = weights
+        self.n_docs = n_docs
+
+    @classmethod
+    def build(cls, texts, k1=BM25_K1, b=BM25_B):
+        doc_terms = []
+        for text in texts:
+            counts = {}
+            for term in tokenize(text):
+                counts[term] = counts.get(term, 0) + 1
+            doc_terms.append(counts)
+        lengths = np.asarray([sum(c.values()) for c in doc_terms], dtype=np.float64)
+        avg_len = lengths.mean() if len(lengths) and lengths.mean() > 0 else 1.0
+        postings = {}
+        for doc, counts in enumerate(doc_terms):
+            for term, tf in counts.items():
+                postings.setdefault(term, []).append((doc, tf))
+
+        vocab, indptr, docs, weights = {}, [0], [], []
+        n = len(texts)
+        for term in sorted(postings):
+            plist = postings[term]
+            idf = math.log(1 + (n - len(plist) + 0.5) / (len(plist) + 0.5))
+            vocab[term] = len(vocab)
+            for doc, tf in plist:
+                docs.append(doc)
+                weights.append(idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths[doc] / avg_len)))
+            indptr.append(len(docs))
+        return cls(vocab, np.asarray(indptr, dtype=np.int64), np.asarray(docs, dtype=np.int32),
+                   np.asarray(weights, dtype=np.float32), n)
+
+    def save(self, path):
+        with open(os.path.join(path, VOCAB_FILE), "w", encoding="utf-8") as f:
+            json.dump({"n_docs": self.n_docs, "terms": self.vocab}, f, separators=(",", ":"))
+        np.save(os.path.join(path, "bm25_indptr.npy"), self.indptr)
+        np.save(os.path.join(path, "bm25_docs.npy"), self.docs)
+        np.save(os.path.join(path, "bm25_weights.npy"), self.weights)
+
+    @classmethod
+    def load(cls, path):
+        with open(os.path.join(path, VOCAB_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        arrays = [np.load(os.path.join(path, f"bm25_{name}.npy"), mmap_mode="r")
+                  for name in ("indptr", "docs", "weights")]
+        return cls(meta["terms"], *arrays, meta["n_docs"])
+
+    def scores(self, query):
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        for term in set(tokenize(query)):
+            row = self.vocab.get(term)
+            if row is not None:
+                lo, hi = self.indptr[row], self.indptr[row + 1]
+                np.add.at(scores, self.docs[lo:hi], self.weights[lo:hi])
+        return scores
+
+    # Row ids of the n best-scoring chunks (only chunks matching some term)
+    def top(self, query, n):
+        scores = self.scores(query)
+        hits = np.flatnonzero(scores)
+        if len(hits) > n:
+            hits = hits[np.argpartition(-scores[hits], n)[:n]]
+        return [int(i) for i in hits[np.argsort(-scores[hits], kind="stable")]]
+
+
+def has_bm25_index(path):
+    return os.path.exists(os.path.join(path, VOCAB_FILE))
+
+
+# Reciprocal rank fusion of several ranked id lists
+def fuse(rankings, k=RRF_K):
+    fused = {}
+    for ranking in rankings:
+        for rank, i in enumerate(ranking):
+            fused[i] = fused.get(i, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(fused, key=lambda i: -fused[i])
+
+
+# Cross-encoder rerank under a time budget: candidates are scored in fused
+# order, batch by batch, until the budget runs out. Scored candidates are
+# ordered by score; any left unscored keep their fused order after them.
+class Reranker:
+    def __init__(self, model_name, budget_ms=RERANK_BUDGET_MS, batch_size=RERANK_BATCH):
+        from sentence_transformers import CrossEncoder
+
+        self.model = CrossEncoder(model_name, device="cpu")
+        self.budget_ms = budget_ms
+        self.batch_size = batch_size
+
+    def rerank(self, query, ids, texts):
+        start = time.perf_counter()
+        scored = []
+        for lo in range(0, len(ids), self.batch_size):
+            if (time.perf_counter() - start) * 1000 > self.budget_ms:
+                break
+            batch = list(range(lo, min(lo + self.batch_size, len(ids))))
+            scores = self.model.predict([(query, texts[i]) for i in batch])
+            scored.extend(zip(batch, scores))
+        order = [i for i, _ in sorted(scored, key=lambda s: -s[1])]
+        order += list(range(len(scored), len(ids)))
+        return [ids[i] for i in order]
+
+
+# Top-k chunk row ids for a query: dense + BM25 candidates fused, then
+# optionally reranked. `dense_ids` are FAISS neighbours in rank order;
+# `get_text(i)` returns chunk i's text (only called when reranking).
+def hybrid_search(query, dense_ids, bm25, k, reranker=None, get_text=None, candidates=CANDIDATES):
+    fused = fuse([dense_ids[:candidates], bm25.top(query, candidates)])
+    if reranker is None:
+        return fused[:k]
+    pool = fused[:candidates]
+    return reranker.rerank(query, pool, [get_text(i) for i in pool])[:k]
+
+
+def main(argv=None):
+    from strengthai.chunk_store import ChunkStore
+
+    parser = argparse.ArgumentParser(description="Build the BM25 index for a Milo index directory.")
+    parser.add_argument("index", help="Index directory with a chunk store")
+    args = parser.parse_args(argv)
+    store = ChunkStore(args.index)
+    BM25Index.build([store.get(i).page_content for i in range(len(store))]).save(args.index)
+    print(f"Indexed {len(store)} chunks in {args.index}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import os
+
+import streamlit as st
+from strengthai.llm_gateway import RPM, TPM, LLMGateway
+
+# Shared Groq chat model behind the LLM gateway (see strengthai.llm_gateway).
+# One pooled client and one rate limiter per (key, model) per server process,
+# so pages don't rebuild the client (or re-import langchain_groq) on every
+# rerun and concurrent sessions share the request budget.
+LLM_MODEL = "llama-3.1-8b-instant"
+BASE_URL_ENV = "STRENGTHAI_GROQ_BASE_URL"  # e.g. a local fake server for load tests
+RPM_ENV = "STRENGTHAI_GROQ_RPM"
+TPM_ENV = "STRENGTHAI_GROQ_TPM"
+
+
+def make_client(groq_api_key, model=LLM_MODEL, base_url=None):
+    from langchain_groq import ChatGroq
+
+    # Retries are the gateway's job, so the SDK must not retry on its own
+    return ChatGroq(groq_api_key=groq_api_key, model=model, base_url=base_url, max_retries=0)
+
+
+@st.cache_resource(show_spinner=False)
+def get_llm(groq_api_key, model=LLM_MODEL):
+    client = make_client(groq_api_key, model, os.environ.get(BASE_URL_ENV) or None)
+    return LLMGateway(client, rpm=int(os.environ.get(RPM_ENV) or RPM), tpm=int(os.environ.get(TPM_ENV) or TPM))
@@ -0,0 +1,210 @@
+import hashlib
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from strengthai.plan_context import count_tokens
+
+# Shared gateway in front of the chat model. Every page goes through one
+# gateway per (key, model) per server process:
+#
+#   - identical prompts already in flight are coalesced (singleflight): the
+#     model is called once and every caller streams the same chunks;
+#   - calls are scheduled on a small worker pool behind token buckets for
+#     requests/min and tokens/min, so a burst of users waits its turn
+#     instead of tripping the provider's limits;
+#   - 429s, 5xx and connection errors are retried with jittered backoff
+#     (honouring Retry-After) as long as nothing has been streamed yet; a 429
+#     also pauses the buckets so queued calls don't hit the same wall.
+#
+# The gateway exposes .stream(prompt) and .invoke(prompt), so it drops in
+# wherever a LangChain chat model was used (stream_text, condense_question).
+RPM = 30
+TPM = 6000
+PERIOD = 60.0
+WORKERS = 4
+MAX_RETRIES = 4
+BACKOFF = 1.0
+MAX_BACKOFF = 30.0
+OUTPUT_TOKENS = 400  # reserved per call for the completion
+
+
+class TokenBucket:
+    def __init__(self, limit, period=PERIOD):
+        self.capacity = float(limit)
+        self.rate = limit / period
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    # Seconds until `amount` is available (0 if it is now)
+    def wait_time(self, amount, now):
+        self._refill(now)
+        return max(0.0, (min(amount, self.capacity) - self.tokens) / self.rate)
+
+    def take(self, amount):
+        self.tokens -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    def __init__(self, rpm=RPM, tpm=TPM, period=PERIOD):
+        self.requests = TokenBucket(rpm, period)
+        self.tokens = TokenBucket(tpm, period)
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    # Block until one request and `tokens` tokens fit in both buckets
+    def acquire(self, tokens):
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = max(self.paused_until - now,
+                           self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now))
+                if wait <= 0:
+                    self.requests.take(1)
+                    self.tokens.take(tokens)
+                    return waited
+            time.sleep(wait)
+            waited += wait
+
+    def pause(self, seconds):
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+# Status code of a provider error (None for connection errors etc.)
+def _status(error):
+    return getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+
+
+def _retry_after(error):
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error):
+    status = _status(error)
+    if status is not None:
+        return status == 429 or status >= 500
+    return type(error).__name__ in ("APIConnectionError", "APITimeoutError", "ConnectionError", "TimeoutError")
+
+
+# Full-jitter exponential backoff, never shorter than the server's Retry-After
+def retry_delay(error, attempt, backoff=BACKOFF, max_backoff=MAX_BACKOFF):
+    delay = random.uniform(0, min(max_backoff, backoff * 2 ** attempt))
+    retry_after = _retry_after(error)
+    return max(delay, retry_after) if retry_after is not None else delay
+
+
+def _text(chunk):
+    return chunk.content if hasattr(chunk, "content") else str(chunk)
+
+
+class _Flight:
+    # One upstream call; any number of callers replay its chunks
+    def __init__(self):
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self._cond = threading.Condition()
+
+    def push(self, text):
+        with self._cond:
+            self.chunks.append(text)
+            self._cond.notify_all()
+
+    def finish(self, error=None):
+        with self._cond:
+            self.done = True
+            self.error = error
+            self._cond.notify_all()
+
+    def __iter__(self):
+        i = 0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: i < len(self.chunks) or self.done)
+                new = self.chunks[i:]
+                done, error = self.done, self.error
+            i += len(new)
+            yield from new
+            if done and i == len(self.chunks):
+                if error is not None:
+                    raise error
+                return
+
+
+class LLMGateway:
+    def __init__(self, client, rpm=RPM, tpm=TPM, period=PERIOD, workers=WORKERS,
+                 max_retries=MAX_RETRIES, backoff=BACKOFF, output_tokens=OUTPUT_TOKENS):
+        self.client = client
+        self.limiter = RateLimiter(rpm, tpm, period)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.output_tokens = output_tokens
+        self.stats = {"calls": 0, "coalesced": 0, "retries": 0, "rate_limited": 0, "failed": 0, "queued_s": 0.0}
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="strengthai-llm")
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    # Text chunks of the model's answer, shared with identical in-flight calls
+    def stream(self, prompt):
+        key = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self._pool.submit(self._run, key, prompt, flight)
+            else:
+                self.stats["coalesced"] += 1
+        return iter(flight)
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def invoke(self, prompt):
+        return "".join(self.stream(prompt))
+
+    def _run(self, key, prompt, flight):
+        tokens = count_tokens(prompt) + self.output_tokens
+        error = None
+        try:
+            attempt = 0
+            while True:
+                self._count("queued_s", self.limiter.acquire(tokens))
+                self._count("calls")
+                try:
+                    for chunk in self.client.stream(prompt):
+                        text = _text(chunk)
+                        if text:
+                            flight.push(text)
+                    break
+                except Exception as e:
+                    # Retrying after output has been streamed would duplicate it
+                    if flight.chunks or attempt >= self.max_retries or not is_retryable(e):
+                        raise
+                    delay = retry_delay(e, attempt, self.backoff)
+                    self._count("retries")
+                    attempt += 1
+                    if _status(e) == 429:
+                        # Everyone waits; acquire() sleeps through the pause
+                        self._count("rate_limited")
+                        self.limiter.pause(delay)
+                    else:
+                        time.sleep(delay)
+        except Exception as e:
+            self._count("failed")
+            error = e
+        # Later identical prompts start a new call rather than replay this one
+        with self._lock:
+            self._flights.pop(key, None)
+        flight.finish(error)
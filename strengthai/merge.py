@@ -0,0 +1,88 @@
+import hashlib
+import json
+from typing import NamedTuple
+
+# Linear-time merge of imported backup data. Every record gets a stable
+# content hash, so duplicates are found with set lookups instead of deep
+# dict comparisons against the whole existing list.
+
+
+class MergeReport(NamedTuple):
+    added: int = 0
+    skipped: int = 0     # identical record already present
+    conflicts: int = 0   # same identity (e.g. start time) but different content
+
+
+def record_hash(record):
+    payload = json.dumps(record, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+# Natural identities used to detect conflicting versions of one record
+def session_identity(session):
+    return session.get("start_time")
+
+
+def plan_identity(plan):
+    return plan.get("timestamp")
+
+
+def injury_identity(injury):
+    return (injury.get("query"), injury.get("test_results"))
+
+
+# Append imported records not already present. Conflicting versions are kept
+# side by side (as before) but counted in the report.
+def merge_records(existing, imported, identity=None):
+    merged = list(existing)
+    hashes = {record_hash(r) for r in existing}
+    identities = {identity(r) for r in existing} if identity else set()
+    added = skipped = conflicts = 0
+    for record in imported:
+        h = record_hash(record)
+        if h in hashes:
+            skipped += 1
+            continue
+        if identity:
+            key = identity(record)
+            if key is not None and key in identities:
+                conflicts += 1
+            identities.add(key)
+        merged.append(record)
+        hashes.add(h)
+        added += 1
+    return merged, MergeReport(added, skipped, conflicts)
+
+
+# Body stats are keyed by (name, date). An identical entry is skipped; a
+# different entry for the same key renames the existing one to
+# "<name>-<imported name>" and is not added.
+def merge_body_stats(existing, imported):
+    merged = [dict(s) for s in existing]
+    by_key, hashes = {}, {}
+    for i, s in enumerate(merged):
+        key = (s["name"], s["date"])
+        by_key.setdefault(key, []).append(i)
+        hashes.setdefault(key, set()).add(record_hash(s))
+    added = skipped = conflicts = 0
+    for entry in imported:
+        key = (entry["name"], entry["date"])
+        matches = by_key.get(key)
+        if not matches:
+            by_key[key] = [len(merged)]
+            hashes.setdefault(key, set()).add(record_hash(entry))
+            merged.append(entry)
+            added += 1
+        elif record_hash(entry) in hashes[key]:
+            skipped += 1
+        else:
+            conflicts += 1
+            del by_key[key]
+            hashes.pop(key, None)
+            for i in matches:
+                s = merged[i]
+                s["name"] = f"{s['name']}-{entry['name']}"
+                new_key = (s["name"], s["date"])
+                by_key.setdefault(new_key, []).append(i)
+                hashes.setdefault(new_key, set()).add(record_hash(s))
+    return merged, MergeReport(added, skipped, conflicts)
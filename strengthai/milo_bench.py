@@ -0,0 +1,106 @@
+import argparse
+import os
+import time
+
+import faiss
+import numpy as np
+from strengthai.milo_index import NLIST, PQ_M, VECTORS_FILE, make_index
+from strengthai.milo_resources import MILO_INDEX_PATH, RETRIEVER_K
+
+# Recall-vs-latency benchmark for Milo's index types. Every candidate is
+# built from the same vectors (a built index's vectors.npy, or synthetic
+# clustered vectors to simulate a larger corpus) and queried one query at a
+# time, as the app does. Recall@k is measured against exact flat search.
+#
+#   python -m strengthai.milo_bench --synthetic 200000 --nprobe 4 8 16 32
+NPROBES = [1, 4, 8, 16, 32, 64]
+
+
+# Clustered unit vectors shaped like sentence embeddings
+def synthetic_vectors(n, dim=384, clusters=500, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, n)] + 0.3 * rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+# Queries are perturbed copies of corpus vectors, like paraphrased questions
+def sample_queries(vectors, n, seed=1):
+    rng = np.random.default_rng(seed)
+    queries = vectors[rng.integers(0, len(vectors), n)]
+    queries = queries + 0.1 * rng.standard_normal(queries.shape).astype(np.float32)
+    return np.ascontiguousarray(queries, dtype=np.float32)
+
+
+def recall_at_k(found, truth):
+    hits = sum(len(set(f) & set(t)) for f, t in zip(found, truth))
+    return hits / truth.size
+
+
+# Per-query search latencies (ms) and the returned ids
+def time_queries(index, queries, k):
+    latencies, found = [], []
+    for q in queries:
+        start = time.perf_counter()
+        _, ids = index.search(q[None, :], k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        found.append(ids[0])
+    return np.asarray(latencies), np.asarray(found)
+
+
+def run(vectors, n_queries=200, k=RETRIEVER_K, nprobes=NPROBES, nlist=NLIST, pq_m=PQ_M):
+    queries = sample_queries(vectors, n_queries)
+    rows = []
+    flat = make_index(vectors, "flat")
+    _, truth = flat.search(queries, k)
+    candidates = [("flat", flat, [None])]
+    for index_type in ("sq8", "ivfsq8", "ivfpq"):
+        start = time.perf_counter()
+        index = make_index(vectors, index_type, nlist, pq_m)
+        candidates.append((index_type, index, nprobes if index_type.startswith("ivf") else [None]))
+        print(f"built {index_type} in {time.perf_counter() - start:.1f}s")
+    for index_type, index, probes in candidates:
+        size_mb = len(faiss.serialize_index(index)) / 1e6
+        for nprobe in probes:
+            if nprobe is not None:
+                faiss.extract_index_ivf(index).nprobe = nprobe
+            latencies, found = time_queries(index, queries, k)
+            rows.append({
+                "index": index_type,
+                "nprobe": nprobe or "-",
+                "size_mb": size_mb,
+                "recall": recall_at_k(found, truth),
+                "p50_ms": float(np.percentile(latencies, 50)),
+                "p95_ms": float(np.percentile(latencies, 95)),
+            })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Milo index types (recall@k vs latency).")
+    parser.add_argument("--index", default=MILO_INDEX_PATH, help="Index directory with vectors.npy")
+    parser.add_argument("--synthetic", type=int, help="Use N synthetic vectors instead of an index")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=RETRIEVER_K)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=NPROBES)
+    parser.add_argument("--nlist", type=int, default=NLIST)
+    parser.add_argument("--pq-m", type=int, default=PQ_M)
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        vectors = synthetic_vectors(args.synthetic)
+    elif os.path.exists(os.path.join(args.index, VECTORS_FILE)):
+        vectors = np.load(os.path.join(args.index, VECTORS_FILE)).astype(np.float32)
+    else:
+        # Notebook-built flat index: read the vectors back out of it
+        index = faiss.read_index(os.path.join(args.index, "index.faiss"))
+        vectors = index.reconstruct_n(0, index.ntotal)
+    print(f"{len(vectors)} vectors, dim {vectors.shape[1]}, {args.queries} queries, k={args.k}")
+    rows = run(vectors, args.queries, args.k, args.nprobe, args.nlist, args.pq_m)
+    print(f"{'index':<7}{'nprobe':>7}{'size MB':>9}{'recall':>8}{'p50 ms':>9}{'p95 ms':>9}")
+    for r in rows:
+        print(f"{r['index']:<7}{r['nprobe']:>7}{r['size_mb']:>9.2f}{r['recall']:>8.3f}{r['p50_ms']:>9.3f}{r['p95_ms']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+import faiss
+import numpy as np
+from pypdf import PdfReader
+from langchain_core.documents import Document
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from strengthai.chunk_store import write_chunk_store
+from strengthai.hybrid_search import BM25Index
+from strengthai.milo_resources import MILO_INDEX_PATH, MODEL_PATH
+
+# Command-line builder for Milo's FAISS index (replaces the notebook).
+# PDF pages are read and split one at a time, chunks are embedded in batches
+# across a process pool, and the finished index directory is swapped in
+# atomically. Every chunk's vector is kept next to the index keyed by a
+# content hash, so a rebuild only embeds chunks that are new or changed.
+#
+#   python -m strengthai.milo_index "pages/data/Rebuilding Milo.pdf" [more.pdf ...]
+#
+# --index-type picks the FAISS layout: "flat" (exact, float32), "sq8"
+# (int8 scalar-quantized, 4x smaller, still exhaustive), "ivfsq8" (inverted
+# lists over int8 codes; only `nprobe` lists are scanned per query) or
+# "ivfpq" (inverted lists + product quantization, smallest and fastest but
+# lossiest; needs ~10k+ chunks to train). The choice is recorded in
+# index_meta.json for the loader.
+DEFAULT_SOURCES = ["pages/data/Rebuilding Milo.pdf"]
+CHUNK_SIZE = 1500
+CHUNK_OVERLAP = 200
+BATCH_SIZE = 64
+VECTORS_FILE = "vectors.npy"
+HASHES_FILE = "chunk_hashes.json"
+INDEX_META_FILE = "index_meta.json"
+INDEX_TYPES = ["flat", "sq8", "ivfsq8", "ivfpq"]
+NLIST = 256
+PQ_M = 48       # sub-quantizers; must divide the embedding dimension (384)
+NPROBE = 16
+
+_worker_embeddings = None
+
+
+def chunk_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+# Document-level metadata in PyPDFLoader's layout: PDF info fields with
+# lower-cased names, then source and page count
+def _pdf_metadata(reader, source):
+    info = {name.lstrip("/").lower(): str(value) for name, value in (reader.metadata or {}).items()}
+    return {"producer": "PyPDF", "creator": "PyPDF", "creationdate": "", **info,
+            "source": source, "total_pages": len(reader.pages)}
+
+
+# Split chunks of every page of every source, one page in memory at a time.
+# Metadata matches what PyPDFLoader + split_documents produced (the notebook
+# build): the PDF fields, 0-based page, page_label and start_index.
+def iter_chunks(sources):
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP, add_start_index=True)
+    for source in sources:
+        reader = PdfReader(source)
+        metadata = _pdf_metadata(reader, source)
+        labels = reader.page_labels
+        for page_no, page in enumerate(reader.pages):
+            page_doc = Document(page_content=page.extract_text() or "",
+                                metadata={**metadata, "page": page_no, "page_label": labels[page_no]})
+            yield from splitter.split_documents([page_doc])
+
+
+def _batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _init_worker(model_path):
+    global _worker_embeddings
+    _worker_embeddings = HuggingFaceEmbeddings(model_name=model_path, model_kwargs={"device": "cpu"})
+
+
+def _embed_batch(texts):
+    return np.asarray(_worker_embeddings.embed_documents(texts), dtype=np.float32)
+
+
+# Identity of an embedding model: a hub name as given, or for a local
+# directory its name plus a digest of its config and file sizes, so swapped
+# weights under the same path count as a different model
+def model_id(model_path):
+    if not os.path.isdir(model_path):
+        return model_path
+    digest = hashlib.sha1()
+    for name in sorted(os.listdir(model_path)):
+        full = os.path.join(model_path, name)
+        if os.path.isfile(full):
+            digest.update(f"{name}:{os.path.getsize(full)};".encode("utf-8"))
+    try:
+        with open(os.path.join(model_path, "config.json"), "rb") as f:
+            digest.update(f.read())
+    except OSError:
+        pass
+    return f"{os.path.basename(os.path.normpath(model_path))}:{digest.hexdigest()[:12]}"
+
+
+# Vectors of the previous build keyed by chunk hash; {} if there is none or
+# it was embedded with a different model
+def load_previous_vectors(path, model=None):
+    try:
+        with open(os.path.join(path, INDEX_META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(os.path.join(path, HASHES_FILE), encoding="utf-8") as f:
+            hashes = json.load(f)
+        vectors = np.load(os.path.join(path, VECTORS_FILE))
+    except (OSError, ValueError):
+        return {}
+    if meta.get("model") != model or meta.get("dim") != vectors.shape[1]:
+        return {}
+    return dict(zip(hashes, vectors))
+
+
+# Embed `texts` in batches; workers > 1 spreads batches over a process pool,
+# each worker loading the model once
+def embed_texts(texts, model_path=MODEL_PATH, batch_size=BATCH_SIZE, workers=1, progress=None):
+    if not texts:
+        return []
+    batches = list(_batches(texts, batch_size))
+    vectors = []
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model_path,)) as pool:
+            for result in pool.map(_embed_batch, batches):
+                vectors.extend(result)
+                if progress:
+                    progress(len(vectors), len(texts))
+    else:
+        _init_worker(model_path)
+        for batch in batches:
+            vectors.extend(_embed_batch(batch))
+            if progress:
+                progress(len(vectors), len(texts))
+    return vectors
+
+
+# FAISS factory string for an index type. nlist is capped so every inverted
+# list gets enough training points on small corpora.
+def factory_string(index_type, n_vectors, nlist=NLIST, pq_m=PQ_M):
+    if index_type == "flat":
+        return "Flat"
+    if index_type == "sq8":
+        return "SQ8"
+    nlist = max(1, min(nlist, n_vectors // 39))
+    if index_type == "ivfsq8":
+        return f"IVF{nlist},SQ8"
+    if index_type == "ivfpq":
+        return f"IVF{nlist},PQ{pq_m}"
+    raise ValueError(f"Unknown index type {index_type!r}; expected one of {INDEX_TYPES}.")
+
+
+def make_index(matrix, index_type="flat", nlist=NLIST, pq_m=PQ_M):
+    index = faiss.index_factory(matrix.shape[1], factory_string(index_type, len(matrix), nlist, pq_m))
+    if not index.is_trained:
+        index.train(matrix)
+    index.add(matrix)
+    return index
+
+
+# Write index.faiss, the memory-mapped chunk store (see chunk_store), the
+# BM25 postings (see hybrid_search) and the per-chunk vectors and hashes used
+# by the next incremental build
+def write_index(docs, hashes, vectors, path, index_type="flat", nlist=NLIST, pq_m=PQ_M, nprobe=NPROBE, model=None):
+    matrix = np.vstack(vectors).astype(np.float32)
+    index = make_index(matrix, index_type, nlist, pq_m)
+
+    tmp_path = f"{path}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    faiss.write_index(index, os.path.join(tmp_path, "index.faiss"))
+    write_chunk_store(docs, tmp_path)
+    BM25Index.build([doc.page_content for doc in docs]).save(tmp_path)
+    np.save(os.path.join(tmp_path, VECTORS_FILE), matrix)
+    with open(os.path.join(tmp_path, HASHES_FILE), "w", encoding="utf-8") as f:
+        json.dump(hashes, f)
+    with open(os.path.join(tmp_path, INDEX_META_FILE), "w", encoding="utf-8") as f:
+        json.dump({
+            "index_type": index_type,
+            "factory": factory_string(index_type, len(matrix), nlist, pq_m),
+            "nprobe": nprobe,
+            "chunks": len(docs),
+            "dim": int(matrix.shape[1]),
+            "model": model,
+        }, f)
+
+    old_path = f"{path}.old"
+    if os.path.exists(path):
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+
+# Build (or incrementally rebuild) the index at `path` from `sources`.
+# Returns (chunks, embedded): total chunks and how many needed embedding.
+def build_index(sources, path=MILO_INDEX_PATH, model_path=MODEL_PATH, batch_size=BATCH_SIZE,
+                workers=1, full=False, progress=None, index_type="flat", nlist=NLIST, pq_m=PQ_M,
+                nprobe=NPROBE):
+    model = model_id(model_path)
+    previous = {} if full else load_previous_vectors(path, model)
+    docs, hashes, missing = [], [], []
+    for doc in iter_chunks(sources):
+        h = chunk_hash(doc.page_content)
+        docs.append(doc)
+        hashes.append(h)
+        if h not in previous:
+            missing.append(h)
+    if not docs:
+        raise ValueError("No text found in the given sources.")
+
+    # Identical chunks (e.g. repeated headers) are embedded once
+    missing = list(dict.fromkeys(missing))
+    texts = {h: doc.page_content for h, doc in zip(hashes, docs)}
+    fresh = embed_texts([texts[h] for h in missing], model_path, batch_size, workers, progress)
+    if fresh and previous and len(fresh[0]) != len(next(iter(previous.values()))):
+        # Same model id but a different embedding size: nothing is reusable
+        missing = list(texts)
+        fresh = embed_texts([texts[h] for h in missing], model_path, batch_size, workers, progress)
+        previous = {}
+    previous.update(zip(missing, fresh))
+
+    write_index(docs, hashes, [previous[h] for h in hashes], path, index_type, nlist, pq_m, nprobe, model)
+    return len(docs), len(missing)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build Milo's FAISS index from PDF sources.")
+    parser.add_argument("sources", nargs="*", default=DEFAULT_SOURCES, help="PDF files to index")
+    parser.add_argument("--out", default=MILO_INDEX_PATH, help="Index directory")
+    parser.add_argument("--model", default=MODEL_PATH, help="Sentence-transformers model path")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--full", action="store_true", help="Re-embed every chunk")
+    parser.add_argument("--index-type", choices=INDEX_TYPES, default="flat")
+    parser.add_argument("--nlist", type=int, default=NLIST, help="IVF lists (ivf* only)")
+    parser.add_argument("--pq-m", type=int, default=PQ_M, help="PQ sub-quantizers (ivfpq only)")
+    parser.add_argument("--nprobe", type=int, default=NPROBE, help="Lists scanned per query (ivf* only)")
+    args = parser.parse_args(argv)
+
+    def progress(done, total):
+        print(f"\rEmbedded {done}/{total} chunks", end="", flush=True)
+
+    chunks, embedded = build_index(args.sources, args.out, args.model, args.batch_size,
+                                   args.workers, args.full, progress, args.index_type,
+                                   args.nlist, args.pq_m, args.nprobe)
+    if embedded:
+        print()
+    print(f"Wrote {chunks} chunks to {args.out} ({embedded} embedded, {chunks - embedded} reused)")
+
+
+if __name__ == "__main__":
+    main()
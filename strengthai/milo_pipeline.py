@@ -0,0 +1,47 @@
+import numpy as np
+import streamlit as st
+
+# Helpers for Ask Milo's retrieve-then-generate pipeline. Replaces
+# ConversationalRetrievalChain: a follow-up with chat history is condensed
+# into a standalone question once (cached), and a question without history
+# goes straight to retrieval.
+CONDENSE_TEMPLATE = """Given the following conversation and a follow up question, rephrase the follow up question to be a standalone question, in its original language.
+
+Chat History:
+{chat_history}
+Follow Up Input: {question}
+Standalone question:"""
+
+# Step 2 reuses step 1's chunks when its query embedding is at least this
+# similar to step 1's (the test results refine the same complaint)
+REUSE_THRESHOLD = 0.8
+
+
+# Same history rendering as ConversationalRetrievalChain's default
+def format_chat_history(chat_history):
+    return "".join(f"\nHuman: {human}\nAssistant: {ai}" for human, ai in chat_history)
+
+
+# One LLM call per distinct (question, history); repeats (reruns, retries,
+# other sessions asking the same follow-up) are served from the cache
+@st.cache_data(max_entries=256, show_spinner=False)
+def condense_question(_llm, question, chat_history):
+    prompt = CONDENSE_TEMPLATE.format(chat_history=format_chat_history(chat_history), question=question)
+    answer = _llm.invoke(prompt)
+    return (answer.content if hasattr(answer, "content") else str(answer)).strip() or question
+
+
+def cosine(a, b):
+    a, b = np.asarray(a, dtype=np.float32), np.asarray(b, dtype=np.float32)
+    denom = np.linalg.norm(a) * np.linalg.norm(b)
+    return float(a @ b / denom) if denom else 0.0
+
+
+# Chunk ids from an earlier retrieval ({"vec", "chunk_ids"}) if the new
+# query is close enough to reuse them, else None
+def reusable_chunks(query_vec, previous, threshold=REUSE_THRESHOLD):
+    if not previous or not previous.get("chunk_ids"):
+        return None
+    if cosine(query_vec, previous["vec"]) >= threshold:
+        return list(previous["chunk_ids"])
+    return None
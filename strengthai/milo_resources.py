@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+import pickle
+import numpy as np
+import streamlit as st
+from strengthai.hybrid_search import CANDIDATES, RERANK_BUDGET_MS, BM25Index, Reranker, has_bm25_index, hybrid_search
+from strengthai.semantic_cache import SemanticCache
+from strengthai.tracing import span
+
+# Process-wide Milo resources. st.cache_resource shares one instance across
+# all sessions and reruns of the server process, so the MiniLM weights and
+# the FAISS index are loaded once instead of on every widget interaction.
+# faiss, LangChain and sentence-transformers (torch) are imported inside the
+# loaders, so importing this module is cheap; strengthai.startup preloads
+# them in the background.
+MODEL_PATH = "./models"
+MILO_INDEX_PATH = "pages/data/milo_index"
+RETRIEVER_K = 5
+MILO_CACHE_PATH = "pages/data/milo_cache.json"
+INDEX_META_FILE = "index_meta.json"
+NPROBE_ENV = "STRENGTHAI_MILO_NPROBE"  # overrides the nprobe stored with an IVF index
+RERANKER_ENV = "STRENGTHAI_MILO_RERANKER"  # cross-encoder name/path; unset disables reranking
+RERANK_BUDGET_ENV = "STRENGTHAI_MILO_RERANK_MS"
+EMBEDDINGS_ENV = "STRENGTHAI_MILO_EMBEDDINGS"  # "onnx" for the int8 ONNX Runtime backend; default torch
+
+
+# (name, mtime, size) of every index file; part of the cache key so that a
+# rebuilt index on disk is picked up on the next rerun
+def index_signature(path=MILO_INDEX_PATH):
+    signature = []
+    for name in sorted(os.listdir(path)):
+        stat = os.stat(os.path.join(path, name))
+        signature.append((name, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+@st.cache_resource(show_spinner="Loading Milo's embedding model...")
+def get_embeddings(model_path=MODEL_PATH):
+    if os.environ.get(EMBEDDINGS_ENV, "").lower() == "onnx":
+        from strengthai.onnx_embeddings import ONNX_FILE, OnnxEmbeddings, has_onnx_model
+
+        if not has_onnx_model(model_path):
+            raise FileNotFoundError(f"{os.path.join(model_path, ONNX_FILE)} not found; "
+                                    "run `python -m strengthai.onnx_embeddings export` first")
+        return OnnxEmbeddings(model_path)
+
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+
+    return HuggingFaceEmbeddings(model_name=model_path, model_kwargs={"device": "cpu"})
+
+
+# Build settings written by strengthai.milo_index ({} for notebook-built indexes)
+def index_meta(path=MILO_INDEX_PATH):
+    try:
+        with open(os.path.join(path, INDEX_META_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+# Read index.faiss memory-mapped where the index type supports it, so its
+# codes are paged in from the OS cache instead of copied into each worker
+def read_faiss_index(path, nprobe=None):
+    import faiss
+
+    filename = os.path.join(path, "index.faiss")
+    try:
+        index = faiss.read_index(filename, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+    except RuntimeError:
+        index = faiss.read_index(filename)
+    if nprobe is None:
+        nprobe = os.environ.get(NPROBE_ENV) or index_meta(path).get("nprobe")
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None and nprobe:
+        ivf.nprobe = int(nprobe)
+    return index
+
+
+@st.cache_resource(max_entries=1, show_spinner="Loading Milo's knowledge base...")
+def _load_vectorstore(path, signature):
+    from langchain_community.vectorstores import FAISS
+    from strengthai.chunk_store import ChunkStore, has_chunk_store
+
+    # Memory-mapped index and chunk store; index.pkl is only unpickled for
+    # indexes that predate the chunk store
+    if has_chunk_store(path):
+        docstore = ChunkStore(path)
+        index_to_docstore_id = docstore.index_to_docstore_id()
+    else:
+        with open(os.path.join(path, "index.pkl"), "rb") as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+    return FAISS(get_embeddings(), read_faiss_index(path), docstore, index_to_docstore_id)
+
+
+def get_vectorstore(path=MILO_INDEX_PATH):
+    return _load_vectorstore(path, index_signature(path))
+
+
+# BM25 index saved with the FAISS index, or built in memory from the chunks
+# for indexes that predate it
+@st.cache_resource(max_entries=1)
+def _load_bm25(path, signature):
+    if has_bm25_index(path):
+        return BM25Index.load(path)
+    vectorstore = _load_vectorstore(path, signature)
+    chunks = [vectorstore.docstore.search(vectorstore.index_to_docstore_id[i]) for i in range(vectorstore.index.ntotal)]
+    return BM25Index.build([doc.page_content for doc in chunks])
+
+
+def get_bm25(path=MILO_INDEX_PATH):
+    return _load_bm25(path, index_signature(path))
+
+
+@st.cache_resource(show_spinner="Loading Milo's reranker...")
+def get_reranker():
+    model_name = os.environ.get(RERANKER_ENV)
+    if not model_name:
+        return None
+    return Reranker(model_name, budget_ms=float(os.environ.get(RERANK_BUDGET_ENV) or RERANK_BUDGET_MS))
+
+
+# Shared answer cache for Milo's diagnostic / corrective-plan steps
+@st.cache_resource
+def get_response_cache(path=MILO_CACHE_PATH):
+    return SemanticCache(path)
+
+
+# Version tag for cached answers: changes with the prompt text or the index
+def cache_version(prompt_template, path=MILO_INDEX_PATH):
+    digest = hashlib.sha1(f"{prompt_template}|{index_signature(path)}".encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+# FAISS row ids of the top-k chunks for a query. With the query text, dense
+# neighbours are fused with BM25 matches (and reranked if configured);
+# without it this is plain dense search.
+def retrieve_chunk_ids(query_vec, query=None, path=MILO_INDEX_PATH):
+    with span("retrieval.search"):
+        return _retrieve_chunk_ids(query_vec, query, path)
+
+
+def _retrieve_chunk_ids(query_vec, query, path):
+    # One stat of the index files per query, not one per candidate
+    signature = index_signature(path)
+    vectorstore = _load_vectorstore(path, signature)
+    k = RETRIEVER_K
+    n = max(k, CANDIDATES) if query else k
+    _, ids = vectorstore.index.search(np.asarray([query_vec], dtype=np.float32), n)
+    dense_ids = [int(i) for i in ids[0] if i != -1]
+    if not query:
+        return dense_ids
+    return hybrid_search(query, dense_ids, _load_bm25(path, signature), k, reranker=get_reranker(),
+                         get_text=lambda i: _chunk(vectorstore, i).page_content)
+
+
+def _chunk(vectorstore, i):
+    return vectorstore.docstore.search(vectorstore.index_to_docstore_id[i])
+
+
+# Chunks for the given FAISS row ids, in the same order
+def get_chunks(chunk_ids, path=MILO_INDEX_PATH):
+    vectorstore = get_vectorstore(path)
+    return [_chunk(vectorstore, i) for i in chunk_ids]
+
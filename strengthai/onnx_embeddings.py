@@ -0,0 +1,209 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# Optional ONNX Runtime backend for Milo's MiniLM embeddings. The bundled
+# model is exported once to an int8-quantized ONNX graph that runs with
+# onnxruntime and the model's tokenizer.json, so a Streamlit worker never
+# imports torch:
+#
+#   python -m strengthai.onnx_embeddings export            # writes models/model_int8.onnx
+#   python -m strengthai.onnx_embeddings parity            # same top-k as the torch model?
+#   STRENGTHAI_MILO_EMBEDDINGS=onnx streamlit run Home.py
+#
+# Export and the parity check need torch/transformers; serving needs only
+# onnxruntime and tokenizers. Vectors match sentence-transformers' default
+# for this model: mean pooling over the attention mask, not normalized.
+ONNX_FILE = "model_int8.onnx"
+BATCH_SIZE = 32
+OPSET = 14
+PARITY_MIN_COSINE = 0.99
+
+
+# Longest input the torch path embeds: sentence-transformers truncates at
+# min(max_position_embeddings, tokenizer model_max_length), not at the
+# truncation stored in tokenizer.json
+def max_seq_length(model_path):
+    lengths = []
+    for name, key in (("config.json", "max_position_embeddings"), ("tokenizer_config.json", "model_max_length")):
+        try:
+            with open(os.path.join(model_path, name), encoding="utf-8") as f:
+                lengths.append(int(json.load(f)[key]))
+        except (OSError, KeyError, ValueError):
+            pass
+    return min(lengths) if lengths else 512
+
+
+def has_onnx_model(model_path):
+    return os.path.exists(os.path.join(model_path, ONNX_FILE))
+
+
+def mean_pool(hidden, mask):
+    mask = mask[:, :, None].astype(np.float32)
+    return (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+
+class OnnxEmbeddings(Embeddings):
+    def __init__(self, model_path, onnx_file=ONNX_FILE, batch_size=BATCH_SIZE, threads=None):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_path, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_seq_length(model_path))
+        self.tokenizer.enable_padding(pad_id=self.tokenizer.token_to_id("[PAD]") or 0, pad_token="[PAD]")
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(os.path.join(model_path, onnx_file), options,
+                                            providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.batch_size = batch_size
+
+    def _embed_batch(self, texts):
+        encodings = self.tokenizer.encode_batch(texts)
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        hidden = self.session.run(None, {k: v for k, v in feeds.items() if k in self.input_names})[0]
+        return mean_pool(hidden, feeds["attention_mask"])
+
+    def embed_array(self, texts):
+        # Batch texts of similar length together so little time goes on padding
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        batches = [order[i:i + self.batch_size] for i in range(0, len(order), self.batch_size)]
+        vectors = np.concatenate([self._embed_batch([texts[i] for i in batch]) for batch in batches])
+        return vectors[np.argsort(order)].astype(np.float32)
+
+    def embed_documents(self, texts):
+        return self.embed_array(list(texts)).tolist()
+
+    def embed_query(self, text):
+        return self.embed_array([text])[0].tolist()
+
+
+# Export the bundled PyTorch model to ONNX and quantize its weights to int8
+def export_onnx(model_path, out=None, quantize=True):
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModel
+
+    out = out or os.path.join(model_path, ONNX_FILE)
+    model = AutoModel.from_pretrained(model_path).eval()
+    sample = torch.ones((1, 8), dtype=torch.int64)
+    dynamic = {0: "batch", 1: "sequence"}
+    fp32 = out + ".fp32" if quantize else out
+    with torch.no_grad():
+        torch.onnx.export(
+            model, (sample, sample, torch.zeros_like(sample)), fp32,
+            input_names=["input_ids", "attention_mask", "token_type_ids"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={"input_ids": dynamic, "attention_mask": dynamic, "token_type_ids": dynamic,
+                          "last_hidden_state": dynamic},
+            opset_version=OPSET,
+        )
+    if quantize:
+        quantize_dynamic(fp32, out, weight_type=QuantType.QInt8)
+        os.remove(fp32)
+    return out
+
+
+# Fixed user-style questions for the parity check. They are not taken from
+# the indexed chunks, so a query can't trivially match itself.
+PARITY_QUERIES = [
+    "My lower back hurts when I deadlift",
+    "Sharp pain at the front of my shoulder when I bench press",
+    "Knee pain at the bottom of a squat",
+    "Elbow hurts during bicep curls and pull-ups",
+    "Hip pinching in deep squats",
+    "How do I know if my back pain is a disc problem?",
+    "Which tests check for shoulder impingement?",
+    "Pain down my leg after lifting",
+    "My neck is stiff after overhead press",
+    "How should I warm up with a tweaked lower back?",
+    "Is it safe to keep training through tendon pain?",
+    "Mobility drills for tight hips and ankles",
+]
+WEIGHTS_FILES = ("model.safetensors", "pytorch_model.bin")
+
+
+def has_torch_weights(model_path):
+    return any(os.path.exists(os.path.join(model_path, name)) for name in WEIGHTS_FILES)
+
+
+def _cosines(a, b):
+    return (a * b).sum(axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+
+
+def _top_k(index, vectors, k):
+    return index.search(np.ascontiguousarray(vectors, dtype=np.float32), k)[1]
+
+
+# Embed `queries` with both backends and search the index with each. Any
+# query whose top-k chunk ids (in order) differ is listed in "mismatches";
+# parity holds when that list is empty.
+def parity(model_path, index_path, k, queries=PARITY_QUERIES):
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+    from strengthai.milo_resources import read_faiss_index
+
+    torch_model = HuggingFaceEmbeddings(model_name=model_path, model_kwargs={"device": "cpu"})
+    onnx_model = OnnxEmbeddings(model_path)
+
+    start = time.perf_counter()
+    torch_vecs = np.asarray([torch_model.embed_query(q) for q in queries], dtype=np.float32)
+    torch_s = time.perf_counter() - start
+    start = time.perf_counter()
+    onnx_vecs = np.asarray([onnx_model.embed_query(q) for q in queries], dtype=np.float32)
+    onnx_s = time.perf_counter() - start
+
+    index = read_faiss_index(index_path)
+    torch_ids, onnx_ids = _top_k(index, torch_vecs, k), _top_k(index, onnx_vecs, k)
+    cos = _cosines(torch_vecs, onnx_vecs)
+    mismatches = [(q, a.tolist(), b.tolist()) for q, a, b in zip(queries, torch_ids, onnx_ids) if list(a) != list(b)]
+    return {
+        "queries": len(queries),
+        "min_cosine": float(cos.min()),
+        "mean_cosine": float(cos.mean()),
+        "mismatches": mismatches,
+        "torch_ms_per_query": torch_s * 1000 / len(queries),
+        "onnx_ms_per_query": onnx_s * 1000 / len(queries),
+    }
+
+
+def main(argv=None):
+    from strengthai.milo_resources import MILO_INDEX_PATH, MODEL_PATH, RETRIEVER_K
+
+    parser = argparse.ArgumentParser(description="Int8 ONNX backend for Milo's embedding model.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="Export and quantize the model")
+    export.add_argument("--model", default=MODEL_PATH)
+    export.add_argument("--out", help=f"Output file (default <model>/{ONNX_FILE})")
+    export.add_argument("--no-quantize", action="store_true", help="Keep fp32 weights")
+    check = sub.add_parser("parity", help="Compare ONNX and torch retrieval on fixed queries")
+    check.add_argument("--model", default=MODEL_PATH)
+    check.add_argument("--index", default=MILO_INDEX_PATH)
+    check.add_argument("--k", type=int, default=RETRIEVER_K)
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        print(f"Wrote {export_onnx(args.model, args.out, quantize=not args.no_quantize)}")
+        return
+    report = parity(args.model, args.index, args.k)
+    for name, value in report.items():
+        if name != "mismatches":
+            print(f"{name:<20}{value:.4f}" if isinstance(value, float) else f"{name:<20}{value}")
+    for query, torch_ids, onnx_ids in report["mismatches"]:
+        print(f"MISMATCH {query!r}: torch {torch_ids} onnx {onnx_ids}")
+    if report["mismatches"] or report["min_cosine"] < PARITY_MIN_COSINE:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import math
+
+import streamlit as st
+
+# Page-at-a-time rendering for long lists (history tabs). Only the rows on
+# the current page are turned into widgets; everything else stays as data.
+PAGE_SIZE = 20
+
+
+def page_count(total, page_size=PAGE_SIZE):
+    return max(1, math.ceil(total / page_size))
+
+
+# Positions [start, stop) of `page` (1-based) when `total` items are shown
+# newest-first; positions index into the list in its stored (oldest-first)
+# order, so callers can slice and reverse
+def page_bounds(total, page, page_size=PAGE_SIZE):
+    page = min(max(1, page), page_count(total, page_size))
+    stop = total - (page - 1) * page_size
+    return max(0, stop - page_size), max(0, stop)
+
+
+# Page picker; returns the selected (start, stop) bounds
+def paginate(total, key, page_size=PAGE_SIZE, container=None):
+    container = container or st
+    pages = page_count(total, page_size)
+    page = 1
+    if pages > 1:
+        page = container.number_input(
+            f"Page (1–{pages})", min_value=1, max_value=pages, value=1, step=1, key=key)
+    start, stop = page_bounds(total, page, page_size)
+    container.caption(f"Showing {total - stop + 1}–{total - start} of {total}")
+    return start, stop
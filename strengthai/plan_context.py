@@ -0,0 +1,119 @@
+import re
+from typing import NamedTuple
+
+# Token-budgeted context for Planner prompts. PR rows and injury facts are
+# ranked by relevance to the user's query, rendered as short structured
+# lines and added best-first until the budget is used up, instead of
+# pasting the whole PR table and Milo's full injury answer.
+DEFAULT_TOKEN_BUDGET = 600
+MAX_FACT_CHARS = 240
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_GENERIC_WORDS = frozenset("give me today todays today's full training plan workout session day for my a the and".split())
+
+
+class PlanContext(NamedTuple):
+    text: str
+    tokens: int
+    prs_used: int
+    prs_total: int
+    facts_used: int
+    facts_total: int
+
+
+# Approximate LLM token count: words and punctuation marks, which tracks
+# BPE tokenizers closely for short English/numeric text
+def count_tokens(text):
+    return len(_TOKEN_RE.findall(text or ""))
+
+
+def _words(text):
+    return {w for w in _WORD_RE.findall((text or "").lower()) if len(w) > 1 and w not in _GENERIC_WORDS}
+
+
+def _shorten(text, limit=MAX_FACT_CHARS):
+    text = " ".join((text or "").split())
+    return text if len(text) <= limit else text[:limit - 1].rsplit(" ", 1)[0] + "…"
+
+
+def _fmt(value):
+    return f"{value:g}" if isinstance(value, (int, float)) else str(value)
+
+
+def pr_line(row):
+    return (f"- {row['Exercise']}: e1RM {row['Best 1RM']:.1f} {row['Weight Type']} "
+            f"(best {row['Best Set']}; max {_fmt(row['Max Weight'])} {row['Weight Type']}, {_fmt(row['Max Reps'])} reps)")
+
+
+# PR rows, most relevant first: exercises named in the query, then the most
+# recently improved, then the strongest
+def rank_prs(pr_rows, query):
+    query_words = _words(query)
+
+    def score(row):
+        named = len(query_words & _words(row["Exercise"]))
+        return (-named, -row.get("Session", 0), -row["Best 1RM"])
+
+    return sorted(pr_rows, key=score)
+
+
+# Bullets / sentences of a free-text answer
+def split_facts(text):
+    parts = re.split(r"\n+|(?<=[.!?])\s+(?=[A-Z*#-])", text or "")
+    facts = []
+    for part in parts:
+        part = part.strip().lstrip("-*•#0123456789.) ").strip()
+        if len(part) > 3:
+            facts.append(part)
+    return facts
+
+
+# Injury facts in priority order. The complaint and the user's test results
+# always lead; Milo's recommendations and tests follow, ranked by word
+# overlap with the query, the complaint and the findings.
+def rank_injury_facts(injury, query):
+    if not injury:
+        return []
+    facts = []
+    if injury.get("query"):
+        facts.append(("Complaint", _shorten(injury["query"])))
+    if injury.get("test_results"):
+        facts.append(("Findings", _shorten(injury["test_results"])))
+    focus = _words(query) | _words(injury.get("query")) | _words(injury.get("test_results"))
+    ranked = []
+    for label, field in (("Advice", "response"), ("Test", "tests")):
+        for order, fact in enumerate(split_facts(injury.get(field))):
+            ranked.append((-len(focus & _words(fact)), label != "Advice", order, label, _shorten(fact)))
+    facts.extend((label, fact) for *_, label, fact in sorted(ranked))
+    return facts
+
+
+# Build the Planner context for `query` within `budget` tokens
+def build_plan_context(pr_rows, injury, query, budget=DEFAULT_TOKEN_BUDGET):
+    prs = [pr_line(row) for row in rank_prs(pr_rows, query)]
+    facts = [f"- {label}: {fact}" for label, fact in rank_injury_facts(injury, query)]
+
+    # Interleave so neither section starves the other: the two leading injury
+    # facts (complaint, findings), then PRs and remaining facts alternately
+    queue = [("injury", f) for f in facts[:2]]
+    rest_prs, rest_facts = list(prs), facts[2:]
+    while rest_prs or rest_facts:
+        if rest_prs:
+            queue.append(("prs", rest_prs.pop(0)))
+        if rest_facts:
+            queue.append(("injury", rest_facts.pop(0)))
+
+    headers = {"prs": "Personal records (most relevant first):", "injury": "Injury notes:"}
+    chosen = {"prs": [], "injury": []}
+    used = 0
+    for section, line in queue:
+        cost = count_tokens(line) + (0 if chosen[section] else count_tokens(headers[section]))
+        if used + cost > budget:
+            continue
+        chosen[section].append(line)
+        used += cost
+
+    blocks = [headers[s] + "\n" + "\n".join(chosen[s]) for s in ("prs", "injury") if chosen[s]]
+    text = "\n\n".join(blocks)
+    return PlanContext(text, count_tokens(text), len(chosen["prs"]), len(prs),
+                       len(chosen["injury"]), len(facts))
@@ -0,0 +1,31 @@
+import hashlib
+
+# Plan-request memoization for the Planner page. A request is identified by
+# the PR summary, the injury summary and the query; the model is only called
+# on an explicit submit for a request that has not been answered yet.
+PLAN_CACHE_KEY = "plan_cache"
+CURRENT_PLAN_KEY = "current_plan_key"
+DEFAULT_QUERY = "Give me today's full training plan"
+
+
+def _digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def plan_request_key(pr_summary, injury_summary, query):
+    return f"{_digest(pr_summary)}:{_digest(injury_summary)}:{_digest(query.strip())}"
+
+
+def cached_plan(state, key):
+    return state.setdefault(PLAN_CACHE_KEY, {}).get(key)
+
+
+def remember_plan(state, key, plan_entry):
+    state.setdefault(PLAN_CACHE_KEY, {})[key] = plan_entry
+    state[CURRENT_PLAN_KEY] = key
+
+
+# Plan to keep showing on reruns that were not a submit
+def current_plan(state):
+    key = state.get(CURRENT_PLAN_KEY)
+    return cached_plan(state, key) if key else None
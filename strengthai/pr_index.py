@@ -0,0 +1,127 @@
+import pandas as pd
+from strengthai import analytics
+from strengthai.session_store import session_count
+
+# Persisted personal-records index, keyed by exercise and weight unit.
+# Saving a session updates it in place; restores mark it stale so the next
+# reader rebuilds it once from the full history.
+PR_INDEX_KEY = "pr_index"
+PR_INDEX_VERSION = 1
+PR_INDEX_COLUMNS = ["Exercise", "Weight Type", "Best 1RM", "Best Set", "Max Weight", "Max Reps", "Session"]
+
+
+def empty_pr_index():
+    return {"version": PR_INDEX_VERSION, "stale": False, "sessions": 0, "records": {}}
+
+
+def is_valid_pr_index(index):
+    return (
+        isinstance(index, dict)
+        and index.get("version") == PR_INDEX_VERSION
+        and not index.get("stale")
+        and isinstance(index.get("records"), dict)
+    )
+
+
+def _record_key(exercise, unit):
+    return f"{exercise}|{unit}"
+
+
+def _fmt_set(weight, reps, rpe):
+    return f"{weight:g} x {reps:g} @ RPE {rpe:g}"
+
+
+# Fold one session into the index: O(sets in that session)
+def update_pr_index(index, session, session_no):
+    records = index["records"]
+    unit = session.get("weight_type", "kg")
+    for ex, sets in session.get("exercises", {}).items():
+        for s in sets:
+            one_rm = float(analytics.est_1rm(s["Weight"], s["Reps"], s["RPE"]))
+            key = _record_key(ex, unit)
+            rec = records.get(key)
+            if rec is None:
+                rec = records[key] = {
+                    "Exercise": ex,
+                    "Weight Type": unit,
+                    "Best 1RM": one_rm,
+                    "Best Set": _fmt_set(s["Weight"], s["Reps"], s["RPE"]),
+                    "Max Weight": s["Weight"],
+                    "Max Reps": s["Reps"],
+                    "Session": session_no,
+                    "Session Start": session.get("start_time", ""),
+                }
+                continue
+            if one_rm > rec["Best 1RM"]:
+                rec["Best 1RM"] = one_rm
+                rec["Best Set"] = _fmt_set(s["Weight"], s["Reps"], s["RPE"])
+                rec["Session"] = session_no
+                rec["Session Start"] = session.get("start_time", "")
+            rec["Max Weight"] = max(rec["Max Weight"], s["Weight"])
+            rec["Max Reps"] = max(rec["Max Reps"], s["Reps"])
+    index["sessions"] = max(index.get("sessions", 0), session_no)
+    return index
+
+
+# Full rebuild from history, used only when the index is missing or stale
+def build_pr_index(sessions):
+    index = empty_pr_index()
+    index["sessions"] = len(sessions or [])
+    table = analytics.set_table(sessions)
+    if table.empty:
+        return index
+    grouped = table.groupby(["Exercise", "Weight Type"], sort=False)
+    best = table.loc[grouped["Est. 1RM"].idxmax().to_numpy()]
+    max_weight = grouped["Weight"].max()
+    max_reps = grouped["Reps"].max()
+    for row in best.to_dict("records"):
+        ex, unit = row["Exercise"], row["Weight Type"]
+        index["records"][_record_key(ex, unit)] = {
+            "Exercise": ex,
+            "Weight Type": unit,
+            "Best 1RM": float(row["Est. 1RM"]),
+            "Best Set": _fmt_set(row["Weight"], row["Reps"], row["RPE"]),
+            "Max Weight": max_weight[(ex, unit)].item(),
+            "Max Reps": max_reps[(ex, unit)].item(),
+            "Session": int(row["Session"]) + 1,
+            "Session Start": row["Start"],
+        }
+    return index
+
+
+# Load the persisted index, rebuilding (and persisting) it lazily if needed.
+# An index that doesn't cover exactly the stored sessions is stale, so any
+# drift repairs itself. `load_sessions` is only called on a rebuild, so
+# readers stay O(#records).
+def get_pr_index(localS, load_sessions):
+    index = localS.getItem(PR_INDEX_KEY)
+    if is_valid_pr_index(index) and index.get("sessions") == session_count(localS):
+        return index
+    sessions = load_sessions()
+    index = build_pr_index(sessions)
+    # No sessions may just mean the browser's storage snapshot hasn't arrived
+    # yet (first run of a session); persisting that would wipe the real index
+    if sessions:
+        localS.setItem(PR_INDEX_KEY, index, key="rebuild_pr_index")
+    return index
+
+
+# Append one saved session to the persisted index
+def record_session(localS, index, session, session_no):
+    if index.get("sessions", 0) >= session_no:
+        return index  # already covered, e.g. the index was just rebuilt
+    index = update_pr_index(index, session, session_no)
+    localS.setItem(PR_INDEX_KEY, index, key="save_pr_index")
+    return index
+
+
+# Mark the index stale after history was replaced (e.g. a backup restore)
+def invalidate_pr_index(localS):
+    localS.setItem(PR_INDEX_KEY, {"version": PR_INDEX_VERSION, "stale": True}, key="invalidate_pr_index")
+
+
+def pr_frame(index, unit=None):
+    rows = list(index.get("records", {}).values())
+    if unit is not None:
+        rows = [r for r in rows if r["Weight Type"] == unit]
+    return pd.DataFrame(rows, columns=PR_INDEX_COLUMNS)
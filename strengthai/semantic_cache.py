@@ -0,0 +1,141 @@
+import base64
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# Local cache of Milo answers keyed on the query embedding. A lookup hits when
+# an entry has the same prompt version and retrieved chunk ids and its query
+# embedding is within `threshold` cosine similarity of the new one, so
+# repeated or near-duplicate complaints skip the LLM entirely.
+DEFAULT_THRESHOLD = 0.95
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+
+def _normalize(vec):
+    vec = np.asarray(vec, dtype=np.float32).ravel()
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+def _encode_vec(vec):
+    return base64.b64encode(vec.astype(np.float32).tobytes()).decode("ascii")
+
+
+def _decode_vec(data):
+    return np.frombuffer(base64.b64decode(data), dtype=np.float32)
+
+
+class SemanticCache:
+    def __init__(self, path=None, threshold=DEFAULT_THRESHOLD, max_entries=DEFAULT_MAX_ENTRIES, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.path = path
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # insertion/recency order, oldest first
+        self._next_id = 0
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self._load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, query_vec, chunk_ids, prompt_version):
+        vec = _normalize(query_vec)
+        group = (prompt_version, tuple(sorted(chunk_ids)))
+        with self._lock:
+            self._evict_expired()
+            candidates = [(key, e) for key, e in self._entries.items() if e["group"] == group]
+            if candidates:
+                sims = np.stack([e["vec"] for _, e in candidates]) @ vec
+                best = int(np.argmax(sims))
+                if sims[best] >= self.threshold:
+                    key, entry = candidates[best]
+                    entry["last_used"] = time.time()
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry["response"]
+            self.misses += 1
+            return None
+
+    def store(self, query_vec, chunk_ids, prompt_version, response, query=""):
+        now = time.time()
+        with self._lock:
+            self._entries[self._next_id] = {
+                "group": (prompt_version, tuple(sorted(chunk_ids))),
+                "vec": _normalize(query_vec),
+                "query": query,
+                "response": response,
+                "created": now,
+                "last_used": now,
+            }
+            self._next_id += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._save()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+            self._save()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def _evict_expired(self):
+        if not self.ttl_seconds:
+            return
+        cutoff = time.time() - self.ttl_seconds
+        for key in [k for k, e in self._entries.items() if e["created"] < cutoff]:
+            del self._entries[key]
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for e in data.get("entries", []):
+            self._entries[self._next_id] = {
+                "group": (e["prompt_version"], tuple(e["chunk_ids"])),
+                "vec": _decode_vec(e["vec"]),
+                "query": e.get("query", ""),
+                "response": e["response"],
+                "created": e["created"],
+                "last_used": e.get("last_used", e["created"]),
+            }
+            self._next_id += 1
+        self._evict_expired()
+
+    # Write to a temp file and rename so a crash never leaves a torn cache
+    def _save(self):
+        if not self.path:
+            return
+        entries = [{
+            "prompt_version": e["group"][0],
+            "chunk_ids": list(e["group"][1]),
+            "vec": _encode_vec(e["vec"]),
+            "query": e["query"],
+            "response": e["response"],
+            "created": e["created"],
+            "last_used": e["last_used"],
+        } for e in self._entries.values()]
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "entries": entries}, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,159 @@
+# Chunked localStorage layout for workout_sessions. Sessions live in monthly
+# segments ("workout_sessions:2025-06") listed in a small manifest, so saving
+# a session rewrites only the current month instead of the whole history,
+# and readers can load just the segments they need.
+SESSIONS_KEY = "workout_sessions"  # legacy single-key layout
+MANIFEST_KEY = "workout_sessions_manifest"
+MANIFEST_VERSION = 1
+UNDATED_SEGMENT = "undated"
+
+
+def segment_key(segment):
+    return f"{SESSIONS_KEY}:{segment}"
+
+
+# Month a session belongs to, from its ISO start_time ("YYYY-MM")
+def segment_for(session):
+    start = session.get("start_time") or ""
+    if len(start) >= 7 and start[:4].isdigit() and start[4] == "-" and start[5:7].isdigit():
+        return start[:7]
+    return UNDATED_SEGMENT
+
+
+def _sort_segments(segments):
+    # Undated sessions first, then months in chronological order
+    return sorted(segments, key=lambda seg: (seg != UNDATED_SEGMENT, seg))
+
+
+def _empty_manifest():
+    return {"version": MANIFEST_VERSION, "segments": {}, "count": 0}
+
+
+def _is_manifest(value):
+    return isinstance(value, dict) and value.get("version") == MANIFEST_VERSION
+
+
+def _group_by_segment(sessions):
+    groups = {}
+    for session in sessions:
+        groups.setdefault(segment_for(session), []).append(session)
+    return groups
+
+
+class _Store:
+    # One read/modify/write pass over the chunked layout. Readers never write:
+    # a legacy history is split into segments in memory and only persisted by
+    # the next save/restore, which writes every item at most once.
+    def __init__(self, localS):
+        self.localS = localS
+        self.pending = {}
+        manifest = localS.getItem(MANIFEST_KEY)
+        if _is_manifest(manifest):
+            self.manifest = manifest
+        else:
+            self.manifest = _empty_manifest()
+            self._migrate_legacy()
+
+    def _migrate_legacy(self):
+        legacy = self.localS.getItem(SESSIONS_KEY)
+        if not isinstance(legacy, list) or not legacy:
+            return
+        for segment, sessions in _group_by_segment(legacy).items():
+            self.set_segment(segment, sessions)
+        self.manifest["count"] = len(legacy)
+
+    def segment(self, segment):
+        key = segment_key(segment)
+        value = self.pending[key] if key in self.pending else self.localS.getItem(key)
+        return value if isinstance(value, list) else []
+
+    def set_segment(self, segment, sessions):
+        self.pending[segment_key(segment)] = sessions
+        self.manifest["segments"][segment] = len(sessions)
+
+    def segments(self):
+        return _sort_segments(self.manifest["segments"])
+
+    def flush(self):
+        if not self.pending:
+            return
+        self.manifest["segments"] = {seg: self.manifest["segments"][seg] for seg in self.segments()}
+        self.manifest["count"] = sum(self.manifest["segments"].values())
+        for key, value in self.pending.items():
+            self.localS.setItem(key, value, key=f"set_{key}")
+        self.localS.setItem(MANIFEST_KEY, self.manifest, key=f"set_{MANIFEST_KEY}")
+        self.pending = {}
+
+    # The legacy key is only removed once the manifest and every segment it
+    # lists have been read back from the browser
+    def drop_legacy(self):
+        if self.pending or self.localS.getItem(SESSIONS_KEY) is None:
+            return
+        if all(isinstance(self.localS.getItem(segment_key(seg)), list) for seg in self.manifest["segments"]):
+            self.localS.eraseItem(SESSIONS_KEY, key=f"erase_{SESSIONS_KEY}")
+
+
+def session_count(localS):
+    store = _Store(localS)
+    return store.manifest.get("count", 0)
+
+
+# All sessions (or only the given segments) in chronological segment order
+def load_sessions(localS, segments=None):
+    store = _Store(localS)
+    wanted = store.segments() if segments is None else [s for s in store.segments() if s in segments]
+    sessions = []
+    for segment in wanted:
+        sessions.extend(store.segment(segment))
+    return sessions
+
+
+# One session by its 0-based position in load_sessions' order, reading only
+# the segment that holds it
+def load_session(localS, index):
+    store = _Store(localS)
+    offset = index
+    for segment in store.segments():
+        size = store.manifest["segments"][segment]
+        if offset < size:
+            return store.segment(segment)[offset]
+        offset -= size
+    raise IndexError(f"no session at position {index}")
+
+
+# The last `n` sessions, reading segments newest-first until enough are found
+def load_recent_sessions(localS, n):
+    store = _Store(localS)
+    recent = []
+    for segment in reversed(store.segments()):
+        if len(recent) >= n:
+            break
+        recent = store.segment(segment) + recent
+    return recent[-n:] if n else []
+
+
+# Append one session: rewrites only its month's segment and the manifest.
+# Returns the new total session count.
+def append_session(localS, session):
+    store = _Store(localS)
+    store.drop_legacy()
+    segment = segment_for(session)
+    store.set_segment(segment, store.segment(segment) + [session])
+    store.flush()
+    return store.manifest["count"]
+
+
+# Replace the whole history (e.g. after a restore), writing only the
+# segments whose contents changed
+def replace_sessions(localS, sessions):
+    store = _Store(localS)
+    store.drop_legacy()
+    groups = _group_by_segment(sessions)
+    for segment in list(store.manifest["segments"]):
+        if segment not in groups:
+            store.set_segment(segment, [])
+    for segment, seg_sessions in groups.items():
+        if store.segment(segment) != seg_sessions:
+            store.set_segment(segment, seg_sessions)
+    store.flush()
+    return store.manifest["count"]
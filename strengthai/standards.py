@@ -0,0 +1,134 @@
+import csv
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+from strengthai.catalog import COMPARISON_PATH, load_catalog
+
+# Strength standards from `comparison data/`, loaded once per process into
+# NumPy arrays indexed by (gender, unit, compare type, exercise slug).
+# Lookups binary-search the Age/BW column, interpolate the level thresholds
+# between the bracketing rows and map the lifted value to a continuous
+# percentile.
+LEVELS = ["Beg.", "Nov.", "Int.", "Adv.", "Elite"]
+# "Stronger than X% of lifters" for each level
+LEVEL_PERCENTILES = np.array([5.0, 20.0, 50.0, 80.0, 95.0])
+MAX_PERCENTILE = 99.0
+
+
+class StandardsTable(NamedTuple):
+    x_column: str         # "Age" or "BW"
+    x: np.ndarray         # sorted ascending, shape (n,)
+    thresholds: np.ndarray  # one column per level, shape (n, len(LEVELS))
+
+
+class Rating(NamedTuple):
+    level: str
+    percentile: float
+    row: dict             # interpolated reference standards for the input
+
+
+# None for files that are not a standards table (a few scraped age/power-clean
+# files only hold the level descriptions)
+def _read_table(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if not header or header[0] not in ("Age", "BW") or any(lvl not in header for lvl in LEVELS):
+            return None
+        rows = np.array([[float(v) for v in row] for row in reader if row], dtype=float)
+    if rows.size == 0:
+        return None
+    level_cols = [header.index(lvl) for lvl in LEVELS]
+    order = np.argsort(rows[:, 0], kind="stable")
+    return StandardsTable(header[0], rows[order, 0], rows[order][:, level_cols])
+
+
+@lru_cache(maxsize=None)
+def load_standards(root=COMPARISON_PATH):
+    tables = {}
+    for slug, paths in load_catalog(root).files.items():
+        for (g, u, c), path in paths.items():
+            table = _read_table(path)
+            if table is not None:
+                tables[(g, u, c, slug)] = table
+    return tables
+
+
+# `exercise` may be a display name, logger name, alias or slug
+def get_table(gender, unit, compare_type, exercise, root=COMPARISON_PATH):
+    slug = load_catalog(root).resolve(exercise)
+    return load_standards(root).get((gender, unit, compare_type, slug)) if slug else None
+
+
+# Thresholds at `x`, linearly interpolated between the bracketing rows and
+# clamped to the first/last row outside the table's range. O(log n).
+def interpolate_thresholds(table, x):
+    xs = table.x
+    if x <= xs[0]:
+        return table.thresholds[0].copy()
+    if x >= xs[-1]:
+        return table.thresholds[-1].copy()
+    i = int(np.searchsorted(xs, x, side="right"))
+    lo, hi = xs[i - 1], xs[i]
+    t = (x - lo) / (hi - lo)
+    return table.thresholds[i - 1] + t * (table.thresholds[i] - table.thresholds[i - 1])
+
+
+# Continuous percentiles for values against per-row thresholds, vectorized.
+# Below "Beg." scales from 0; above "Elite" it approaches MAX_PERCENTILE over
+# one more Adv.->Elite gap.
+def percentiles(values, thresholds):
+    values = np.asarray(values, dtype=float)
+    thresholds = np.atleast_2d(thresholds)
+    top = thresholds[:, -1] + (thresholds[:, -1] - thresholds[:, -2])
+    xp = np.column_stack([np.zeros(len(thresholds)), thresholds, top])
+    fp = np.concatenate([[0.0], LEVEL_PERCENTILES, [MAX_PERCENTILE]])
+    seg = np.clip((values[:, None] >= xp).sum(axis=1) - 1, 0, xp.shape[1] - 2)
+    rows = np.arange(len(values))
+    lo, hi = xp[rows, seg], xp[rows, seg + 1]
+    width = np.where(hi > lo, hi - lo, 1.0)
+    frac = np.clip((values - lo) / width, 0.0, 1.0)
+    return np.round(fp[seg] + frac * (fp[seg + 1] - fp[seg]), 1)
+
+
+# Highest level whose threshold the value reaches ("Beg." if none)
+def levels(values, thresholds):
+    values = np.asarray(values, dtype=float)
+    idx = np.clip((values[:, None] >= np.atleast_2d(thresholds)).sum(axis=1) - 1, 0, len(LEVELS) - 1)
+    return [LEVELS[i] for i in idx]
+
+
+def _reference_row(table, x, thresholds):
+    row = {table.x_column: x}
+    row.update({lvl: round(float(v), 1) for lvl, v in zip(LEVELS, thresholds)})
+    return row
+
+
+def rate(gender, unit, compare_type, exercise, value, x, root=COMPARISON_PATH):
+    ratings = rate_many(gender, unit, compare_type, [exercise], [value], x, root=root)
+    return ratings[0]
+
+
+# Rate several exercises in one call: one binary search per exercise, then a
+# single vectorized level/percentile computation. None for unknown exercises.
+def rate_many(gender, unit, compare_type, exercises, values, x, root=COMPARISON_PATH):
+    if x is None:
+        return [None] * len(exercises)
+    found, rows, vals = [], [], []
+    for i, (ex, value) in enumerate(zip(exercises, values)):
+        table = get_table(gender, unit, compare_type, ex, root=root)
+        if table is None:
+            continue
+        found.append((i, table))
+        rows.append(interpolate_thresholds(table, x))
+        vals.append(value)
+    ratings = [None] * len(exercises)
+    if not found:
+        return ratings
+    thresholds = np.vstack(rows)
+    pcts = percentiles(vals, thresholds)
+    lvls = levels(vals, thresholds)
+    for j, (i, table) in enumerate(found):
+        ratings[i] = Rating(lvls[j], float(pcts[j]), _reference_row(table, x, thresholds[j]))
+    return ratings
@@ -0,0 +1,76 @@
+import threading
+import time
+import traceback
+
+from strengthai.tracing import span
+
+# Background warm-up of Milo's heavy dependencies. Importing LangChain, faiss
+# and torch and loading the embedding model, FAISS index and BM25 postings
+# take several seconds on a cold server; Home starts this once per server
+# process so they load while the user looks around, and Milo's pages show
+# "warming up" instead of blocking the script thread.
+#
+# The loaders are the same st.cache_resource functions the pages call, so
+# whatever the thread loads is shared with every session afterwards.
+IDLE, RUNNING, READY, FAILED = "idle", "running", "ready", "failed"
+
+_lock = threading.Lock()
+_thread = None
+_status = {"state": IDLE, "step": None, "error": None, "started": None, "elapsed": None}
+
+
+def _import_llm():
+    import langchain_groq  # noqa: F401
+
+
+def _steps():
+    from strengthai import milo_resources
+
+    return [
+        ("embeddings", milo_resources.get_embeddings),
+        ("index", milo_resources.get_vectorstore),
+        ("bm25", milo_resources.get_bm25),
+        ("llm", _import_llm),
+    ]
+
+
+def _set(**changes):
+    with _lock:
+        _status.update(changes)
+
+
+def _run():
+    try:
+        for name, load in _steps():
+            _set(step=name)
+            with span(f"warmup.{name}"):
+                load()
+        _set(state=READY, step=None)
+    except Exception as e:
+        traceback.print_exc()
+        _set(state=FAILED, error=f"{type(e).__name__}: {e}")
+    finally:
+        _set(elapsed=time.perf_counter() - _status["started"])
+
+
+# Start the warm-up thread unless it is already running or finished
+def start_warmup():
+    global _thread
+    with _lock:
+        if _status["state"] != IDLE:
+            return
+        _status.update(state=RUNNING, started=time.perf_counter())
+        _thread = threading.Thread(target=_run, name="strengthai-warmup", daemon=True)
+    _thread.start()
+
+
+def warmup_status():
+    with _lock:
+        status = dict(_status)
+    if status["state"] == RUNNING:
+        status["elapsed"] = time.perf_counter() - status["started"]
+    return status
+
+
+def is_ready():
+    return warmup_status()["state"] == READY
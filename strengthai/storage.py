@@ -0,0 +1,75 @@
+import streamlit as st
+from streamlit_local_storage import LocalStorage
+from strengthai.tracing import span
+
+# Gateway over browser localStorage. Only reads are batched: everything is
+# fetched with one getAll round trip per browser session (LocalStorage keeps
+# the result in st.session_state under its component key, so reruns reuse
+# it). Writes are coalesced per key (last write wins) and sent by flush() at
+# the end of the script, but each changed key is still its own component
+# call. Queued writes are lost if the script ends early, so pages call
+# localS.rerun() rather than st.rerun(). It exposes the same
+# getItem/setItem/eraseItem surface as LocalStorage, so helpers that take a
+# `localS` work with either.
+COMPONENT_KEY = "storage_init"
+_ERASED = object()
+
+
+class StorageGateway:
+    def __init__(self, component_key=COMPONENT_KEY):
+        self._local = LocalStorage(key=component_key)
+        with span("storage.read"):
+            self._items = self._local.getAll()
+        self._pending = {}
+        self._flushes = 0
+
+    def getItem(self, item_key):
+        return self._items.get(item_key)
+
+    # Typed reads: the stored value if it has the expected type, else default
+    def get_list(self, item_key):
+        value = self._items.get(item_key)
+        return value if isinstance(value, list) and value else []
+
+    def get_dict(self, item_key):
+        value = self._items.get(item_key)
+        return value if isinstance(value, dict) and value else None
+
+    # `key` is accepted for LocalStorage compatibility and ignored
+    def setItem(self, item_key, item_value, key=None):
+        if not item_key or item_value is None or item_value == "":
+            return
+        self._items[item_key] = item_value
+        self._pending[item_key] = item_value
+
+    def eraseItem(self, item_key, key=None):
+        if not item_key:
+            return
+        self._items.pop(item_key, None)
+        self._pending[item_key] = _ERASED
+
+    def has_pending_writes(self):
+        return bool(self._pending)
+
+    # Send all queued writes to the browser, one component call per key.
+    # Call at the end of the page.
+    def flush(self):
+        self._flushes += 1
+        with span("storage.write"):
+            for item_key, value in self._pending.items():
+                component_key = f"flush_{self._flushes}_{item_key}"
+                if value is _ERASED:
+                    self._local.eraseItem(item_key, key=component_key)
+                else:
+                    self._local.setItem(item_key, value, key=component_key)
+        self._pending = {}
+
+    # st.rerun() that doesn't drop writes queued earlier in this run
+    def rerun(self):
+        if self.has_pending_writes():
+            self.flush()
+        st.rerun()
+
+
+def get_storage():
+    return StorageGateway()
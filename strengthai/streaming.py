@@ -0,0 +1,27 @@
+import streamlit as st
+from strengthai.tracing import trace_stream
+
+# Token streaming for LLM responses. Works with any LangChain chat model or
+# LLM exposing .stream() (ChatGroq in the app, a fake streaming model in tests).
+
+
+# Yield text deltas as the model produces them (traced as llm.ttft / llm.total)
+def stream_text(llm, prompt):
+    for chunk in trace_stream(llm.stream(prompt)):
+        text = chunk.content if hasattr(chunk, "content") else str(chunk)
+        if text:
+            yield text
+
+
+# Render a text stream incrementally and return the full text once complete
+def write_stream(chunks, container=None):
+    container = container or st
+    parts = []
+
+    def tee():
+        for text in chunks:
+            parts.append(text)
+            yield text
+
+    container.write_stream(tee())
+    return "".join(parts)
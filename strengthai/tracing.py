@@ -0,0 +1,126 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+
+# Lightweight per-rerun timing spans. Off unless STRENGTHAI_TRACE is set (or
+# STRENGTHAI_TRACE_FILE, which also appends one JSON line per rerun to that
+# file). When off, span() hands back a shared no-op context manager, so the
+# cost at each call site is one flag check.
+#
+#   begin_rerun("Home") ... with span("storage.read"): ... ... end_rerun()
+#
+# Spans of the current rerun are kept per script thread; finished reruns
+# feed process-wide rolling windows that back the sidebar debug panel.
+TRACE_ENV = "STRENGTHAI_TRACE"
+TRACE_FILE_ENV = "STRENGTHAI_TRACE_FILE"
+WINDOW = 500
+
+TRACE_FILE = os.environ.get(TRACE_FILE_ENV) or None
+ENABLED = bool(os.environ.get(TRACE_ENV) or TRACE_FILE)
+
+_local = threading.local()
+_lock = threading.Lock()
+_windows = {}
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+def span(name):
+    return _Span(name) if ENABLED else _NULL_SPAN
+
+
+# Add a measured duration to the current rerun (and the rolling window)
+def record(name, ms):
+    spans = getattr(_local, "spans", None)
+    if spans is not None:
+        spans.append((name, ms))
+    with _lock:
+        _windows.setdefault(name, deque(maxlen=WINDOW)).append(ms)
+
+
+def begin_rerun(page):
+    if not ENABLED:
+        return
+    _local.page = page
+    _local.spans = []
+    _local.start = time.perf_counter()
+
+
+# Close the rerun: record its total, export it and show the debug panel
+def end_rerun(container=None):
+    if not ENABLED or getattr(_local, "spans", None) is None:
+        return
+    total = (time.perf_counter() - _local.start) * 1000
+    record("rerun", total)
+    spans, _local.spans = _local.spans, None
+    if TRACE_FILE:
+        line = {"ts": datetime.now().isoformat(), "page": _local.page,
+                "spans": [{"name": n, "ms": round(ms, 3)} for n, ms in spans]}
+        with _lock, open(TRACE_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(line) + "\n")
+    debug_panel(spans, container)
+
+
+# p50/p95/p99 (ms) and sample count per span name over the rolling window
+def percentiles():
+    with _lock:
+        windows = {name: list(values) for name, values in _windows.items()}
+    return {
+        name: dict(zip(("p50", "p95", "p99"), np.percentile(values, [50, 95, 99]).round(2)), n=len(values))
+        for name, values in sorted(windows.items())
+    }
+
+
+# Generator wrapper for streamed LLM output: records `<name>.ttft` at the
+# first chunk and `<name>.total` when the stream ends
+def trace_stream(chunks, name="llm"):
+    return _traced_stream(chunks, name) if ENABLED else chunks
+
+
+def _traced_stream(chunks, name):
+    start = time.perf_counter()
+    first = True
+    for chunk in chunks:
+        if first:
+            record(f"{name}.ttft", (time.perf_counter() - start) * 1000)
+            first = False
+        yield chunk
+    record(f"{name}.total", (time.perf_counter() - start) * 1000)
+
+
+def debug_panel(spans, container=None):
+    import pandas as pd
+    import streamlit as st
+
+    container = container or st.sidebar
+    with container.expander("⏱️ Timings"):
+        st.dataframe(pd.DataFrame(spans, columns=["Span", "ms"]).round(2), hide_index=True)
+        st.caption(f"Rolling percentiles (last {WINDOW} per span, this server process)")
+        st.dataframe(pd.DataFrame.from_dict(percentiles(), orient="index"))
@@ -0,0 +1,147 @@
+import threading
+import time
+
+import pytest
+
+from benchmarks.fake_groq import ANSWER, FakeGroq
+from strengthai.llm_gateway import LLMGateway, RateLimiter, TokenBucket
+
+pytest.importorskip("langchain_groq")
+from strengthai.llm import make_client  # noqa: E402
+
+
+@pytest.fixture
+def server():
+    servers = []
+
+    def start(**kwargs):
+        srv = FakeGroq(**kwargs).start()
+        servers.append(srv)
+        return srv
+
+    yield start
+    for srv in servers:
+        srv.shutdown()
+        srv.server_close()
+
+
+def _gateway(srv, **kwargs):
+    kwargs.setdefault("rpm", 1000)
+    kwargs.setdefault("tpm", 10 ** 9)
+    return LLMGateway(make_client("fake", "fake-model", srv.url), **kwargs)
+
+
+def _concurrently(fn, args):
+    results = [None] * len(args)
+
+    def run(i):
+        try:
+            results[i] = fn(args[i])
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(args))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(30)
+    return results
+
+
+def test_identical_concurrent_prompts_share_one_upstream_call(server):
+    srv = server(first_token_s=0.3)
+    gateway = _gateway(srv)
+    results = _concurrently(gateway.invoke, ["Give me today's plan"] * 8)
+    assert results == [ANSWER] * 8
+    assert srv.stats["requests"] == 1
+    assert gateway.stats["calls"] == 1 and gateway.stats["coalesced"] == 7
+
+
+def test_429_is_retried_no_sooner_than_retry_after_and_pauses_queued_calls(server):
+    srv = server(rpm=1, window=1.0, first_token_s=0.05)
+    gateway = _gateway(srv, backoff=0.01)
+    assert gateway.invoke("first") == ANSWER
+
+    second = threading.Thread(target=gateway.invoke, args=("second",))
+    second.start()
+    deadline = time.monotonic() + 5
+    while srv.stats["rate_limited"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # Queued after the 429: must wait out the pause instead of hitting the server
+    third = threading.Thread(target=gateway.invoke, args=("third",))
+    third.start()
+    second.join(10)
+    third.join(10)
+
+    rejected_at, _, retry_after = next(entry for entry in srv.log if entry[1] == 429)
+    later = [t for t, _, _ in srv.log if t > rejected_at]
+    assert later and min(later) >= rejected_at + retry_after - 0.01
+    assert gateway.stats["failed"] == 0 and gateway.stats["rate_limited"] >= 1
+
+
+class _FailingMidStream:
+    # Streams one chunk, then fails with a (normally retryable) 503
+    def __init__(self):
+        self.calls = 0
+
+    def stream(self, prompt):
+        self.calls += 1
+        yield "partial "
+        time.sleep(0.2)
+        error = RuntimeError("upstream dropped the stream")
+        error.status_code = 503
+        raise error
+
+
+def test_error_after_first_chunk_reaches_every_caller_without_retry():
+    client = _FailingMidStream()
+    gateway = LLMGateway(client, rpm=1000, tpm=10 ** 9, backoff=0.01)
+
+    def consume(prompt):
+        received = []
+        try:
+            for text in gateway.stream(prompt):
+                received.append(text)
+        except RuntimeError as e:
+            return received, e
+        return received, None
+
+    results = _concurrently(consume, ["same prompt"] * 5)
+    assert client.calls == 1
+    assert gateway.stats["retries"] == 0 and gateway.stats["failed"] == 1
+    for received, error in results:
+        assert received == ["partial "]
+        assert isinstance(error, RuntimeError)
+
+
+def test_token_bucket_wait_time():
+    bucket = TokenBucket(2, period=1.0)
+    now = bucket.updated
+    assert bucket.wait_time(1, now) == 0
+    bucket.take(2)
+    assert bucket.wait_time(1, now) == pytest.approx(0.5)
+    assert bucket.wait_time(1, now + 0.5) == pytest.approx(0)
+
+
+def test_acquire_waits_for_the_request_budget():
+    limiter = RateLimiter(rpm=2, tpm=10 ** 6, period=1.0)
+    assert limiter.acquire(1) == 0 and limiter.acquire(1) == 0
+    start = time.monotonic()
+    limiter.acquire(1)
+    assert 0.4 <= time.monotonic() - start < 0.8
+
+
+def test_acquire_waits_for_the_token_budget():
+    limiter = RateLimiter(rpm=1000, tpm=100, period=1.0)
+    limiter.acquire(60)
+    start = time.monotonic()
+    limiter.acquire(60)  # 20 tokens short at 100 tokens/s
+    assert 0.15 <= time.monotonic() - start < 0.5
+
+
+def test_pause_holds_back_acquire():
+    limiter = RateLimiter(rpm=1000, tpm=10 ** 6, period=1.0)
+    limiter.pause(0.3)
+    start = time.monotonic()
+    limiter.acquire(1)
+    assert 0.28 <= time.monotonic() - start < 0.6
@@ -0,0 +1,23 @@
+import pytest
+
+from strengthai.milo_resources import MILO_INDEX_PATH, MODEL_PATH, RETRIEVER_K
+from strengthai.onnx_embeddings import ONNX_FILE, PARITY_MIN_COSINE, has_onnx_model, has_torch_weights, parity
+
+# Retrieval with the int8 ONNX backend must return exactly the chunks the
+# torch model does. Needs the model weights, the exported graph
+# (python -m strengthai.onnx_embeddings export) and both runtimes.
+pytest.importorskip("onnxruntime")
+pytest.importorskip("tokenizers")
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("faiss")
+
+if not has_torch_weights(MODEL_PATH):
+    pytest.skip(f"no model weights in {MODEL_PATH}", allow_module_level=True)
+if not has_onnx_model(MODEL_PATH):
+    pytest.skip(f"{ONNX_FILE} not exported", allow_module_level=True)
+
+
+def test_onnx_retrieval_matches_torch():
+    report = parity(MODEL_PATH, MILO_INDEX_PATH, RETRIEVER_K)
+    assert report["mismatches"] == []
+    assert report["min_cosine"] >= PARITY_MIN_COSINE
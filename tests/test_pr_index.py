@@ -0,0 +1,52 @@
+from benchmarks.synthetic import MemoryStorage, generate_sessions
+from strengthai.pr_index import PR_INDEX_KEY, build_pr_index, get_pr_index, record_session
+from strengthai.session_store import append_session, load_sessions, replace_sessions
+
+
+def _populated(sessions):
+    store = MemoryStorage()
+    replace_sessions(store, sessions)
+    store.setItem(PR_INDEX_KEY, build_pr_index(sessions))
+    return store
+
+
+def test_empty_first_read_does_not_overwrite_the_stored_index():
+    sessions = generate_sessions(30, seed=1)
+    browser = _populated(sessions)
+    stored = browser.getItem(PR_INDEX_KEY)
+
+    # First script run: the storage component hasn't delivered getAll yet
+    first_run = MemoryStorage()
+    index = get_pr_index(first_run, lambda: load_sessions(first_run))
+    assert index["records"] == {}
+    assert first_run.getItem(PR_INDEX_KEY) is None
+
+    # Next rerun sees the real snapshot and its index, untouched
+    index = get_pr_index(browser, lambda: load_sessions(browser))
+    assert index == stored
+    assert index["sessions"] == 30 and index["records"]
+
+
+def test_index_that_drifted_from_the_session_count_is_rebuilt():
+    sessions = generate_sessions(30, seed=2)
+    store = _populated(sessions)
+    # An empty index persisted by an older version from an unloaded snapshot
+    store.setItem(PR_INDEX_KEY, build_pr_index([]))
+
+    index = get_pr_index(store, lambda: load_sessions(store))
+    assert index == build_pr_index(sessions)
+    assert store.getItem(PR_INDEX_KEY) == index
+
+
+def test_saving_a_session_updates_the_index_without_a_rebuild():
+    sessions = generate_sessions(31, seed=3)
+    store = _populated(sessions[:30])
+
+    def no_rebuild():
+        raise AssertionError("index should not be rebuilt")
+
+    index = get_pr_index(store, no_rebuild)
+    session_no = append_session(store, sessions[30])
+    index = record_session(store, index, sessions[30], session_no)
+    assert index["records"] == build_pr_index(sessions)["records"]
+    assert get_pr_index(store, no_rebuild) == index
@@ -0,0 +1,20 @@
+import pytest
+
+from benchmarks.synthetic import MemoryStorage, generate_sessions
+from strengthai.session_store import SESSIONS_KEY, load_session, load_sessions, replace_sessions
+
+
+def test_load_session_matches_position_in_full_history():
+    store = MemoryStorage()
+    replace_sessions(store, generate_sessions(120, seed=3))
+    sessions = load_sessions(store)
+    for i in (0, 1, 59, 119):
+        assert load_session(store, i) == sessions[i]
+    with pytest.raises(IndexError):
+        load_session(store, 120)
+
+
+def test_load_session_reads_a_legacy_history():
+    sessions = generate_sessions(40, seed=4)
+    store = MemoryStorage({SESSIONS_KEY: sessions})
+    assert load_session(store, 39) == load_sessions(store)[39]
@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+
+from strengthai.streaming import stream_text, write_stream
+
+
+class FakeStreamingModel:
+    # Stands in for ChatGroq: .stream() yields message chunks with .content
+    def __init__(self, parts):
+        self.parts = parts
+        self.prompts = []
+
+    def stream(self, prompt):
+        self.prompts.append(prompt)
+        for part in self.parts:
+            yield SimpleNamespace(content=part)
+
+
+class FakeContainer:
+    def __init__(self):
+        self.seen = []
+
+    def write_stream(self, chunks):
+        for chunk in chunks:
+            self.seen.append(chunk)
+
+
+def test_stream_text_yields_deltas_and_skips_empty_chunks():
+    llm = FakeStreamingModel(["Squat ", "", "3x5 ", "@ RPE 8"])
+    assert list(stream_text(llm, "plan")) == ["Squat ", "3x5 ", "@ RPE 8"]
+    assert llm.prompts == ["plan"]
+
+
+def test_stream_text_accepts_plain_string_chunks():
+    llm = SimpleNamespace(stream=lambda prompt: iter(["a", "b"]))
+    assert list(stream_text(llm, "x")) == ["a", "b"]
+
+
+def test_write_stream_renders_incrementally_and_returns_full_text():
+    container = FakeContainer()
+    text = write_stream(stream_text(FakeStreamingModel(["Warm up, ", "then ", "work sets."]), "plan"), container)
+    assert container.seen == ["Warm up, ", "then ", "work sets."]
+    assert text == "Warm up, then work sets."